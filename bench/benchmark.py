@@ -0,0 +1,191 @@
+"""Offline benchmarks for WebDriverService against a local fake course site.
+
+Usage: python3 bench/benchmark.py [--ticks N] [--pages N] [--delay MS] [--rounds N]
+                                  [--backend selenium|cdp]
+
+Requires Chrome and the packages in requirements.txt. The browser runs with
+the lean headless profile unless LEAN_BROWSER/HEADLESS are set otherwise.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from fake_site import FakeCourseSite, free_port
+
+PORT = free_port()
+os.environ.update(
+    {
+        "USERNAME": "benchmark",
+        "PASSWORD": "benchmark",
+        "BOT_TOKEN": "benchmark",
+        "COURSE_URL": f"http://127.0.0.1:{PORT}/course.html",
+        "LOGIN_URL": f"http://127.0.0.1:{PORT}/login.html",
+        # settings.json overrides the environment, so keep the user's out
+        "SETTINGS_FILE": os.path.join(BENCH_DIR, "no-settings.json"),
+    }
+)
+os.environ.setdefault("LEAN_BROWSER", "true")
+os.environ.setdefault("HEADLESS", "true")
+os.environ.pop("CHROME_PROFILE_DIR", None)
+
+from config.config import Config
+from fake_discord import FakeBot
+from services.driver_backend import BACKENDS
+from services.webdriver_service import WebDriverService
+
+# fixture -> probe field that must be set when the page is loaded
+PROBE_CASES = {
+    "course.html": "resume_chapter_button",
+    "lesson.html": "next_button",
+    "still_here.html": "still_here_button",
+    "alert.html": "alert",
+    "quiz.html": "quiz_visible",
+    "sign_quiz.html": "sign_quiz",
+    "lockout.html": "locked_out",
+}
+
+# fixtures the detectors should navigate away from on their own
+TRANSITION_CASES = [
+    "course.html",
+    "still_here.html",
+    "alert.html",
+    "quiz.html",
+    "sign_quiz.html",
+]
+
+MODES = {"event-driven": True, "polling": False}
+
+
+def ms(seconds):
+    return f"{seconds * 1000:8.1f} ms"
+
+
+async def current_url(service):
+    return await service.call(service.backend.current_url)
+
+
+async def bench_probe(service, site, rounds):
+    """Measures probe latency on every fixture and checks its state is detected."""
+    print("\nProbe latency per page state")
+    for fixture, field in PROBE_CASES.items():
+        await service.call(service.backend.get, site.url(fixture))
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            state = await service.probe_page()
+            timings.append(time.perf_counter() - started)
+        detected = "ok" if state[field] else "NOT DETECTED"
+        print(f"  {fixture:<18}{ms(statistics.mean(timings))}  {field}: {detected}")
+
+
+async def bench_ticks(service, site, ticks):
+    """Measures tick throughput on a page where no detector matches."""
+    await service.call(service.backend.get, site.url("done.html"))
+    service.metrics.reset()
+
+    started = time.perf_counter()
+    for _ in range(ticks):
+        await service.automate()
+    elapsed = time.perf_counter() - started
+
+    commands = service.metrics.tick_webdriver_commands / ticks
+    print(
+        f"\nIdle ticks: {ticks / elapsed:.1f} ticks/s, "
+        f"{commands:.1f} WebDriver commands/tick"
+    )
+
+
+async def bench_transitions(service, site):
+    """Measures how long the loop takes to act on each page state."""
+    print("\nState transition latency")
+    for mode, event_driven in MODES.items():
+        Config.EVENT_DRIVEN = event_driven
+        for fixture in TRANSITION_CASES:
+            url = site.url(fixture)
+            await service.call(service.backend.get, url)
+            service.page_token = None
+
+            service.poller.reset()
+
+            started = time.perf_counter()
+            while await current_url(service) == url:
+                changed = await service.automate()
+                if await current_url(service) != url:
+                    break
+                await service.wait_for_next_tick(changed)
+            elapsed = time.perf_counter() - started
+            print(f"  {mode:<14}{fixture:<18}{ms(elapsed)}")
+
+
+async def bench_lesson_chain(service, site, pages, delay):
+    """Measures the delay between the next button appearing and it being followed."""
+    print(f"\nLesson chain: {pages} pages, next button after {delay} ms")
+    for mode, event_driven in MODES.items():
+        Config.EVENT_DRIVEN = event_driven
+        await service.call(service.backend.get, site.url("done.html"))
+        await service.call(service.backend.execute_script, "sessionStorage.clear();")
+        await service.call(
+            service.backend.get,
+            site.url(f"lesson.html?page=1&delay={delay}&pages={pages}"),
+        )
+        service.page_token = None
+
+        service.poller.reset()
+
+        started = time.perf_counter()
+        while not (await current_url(service)).endswith("done.html"):
+            changed = await service.automate()
+            await service.wait_for_next_tick(changed)
+        elapsed = time.perf_counter() - started
+
+        latencies = await service.call(
+            service.backend.execute_script,
+            "return JSON.parse(sessionStorage.getItem('latencies') || '[]');",
+        )
+        latencies = sorted(latency / 1000 for latency in latencies)
+        print(
+            f"  {mode:<14}total {elapsed:6.2f} s, reaction mean "
+            f"{ms(statistics.mean(latencies))}, max {ms(latencies[-1])}"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--delay", type=int, default=1500)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument(
+        "--backend", choices=list(BACKENDS), default=Config.DRIVER_BACKEND.lower()
+    )
+    args = parser.parse_args()
+    Config.DRIVER_BACKEND = args.backend
+
+    bot = FakeBot()
+    bot.outbox.start()
+    service = WebDriverService(bot)
+
+    with FakeCourseSite(PORT) as site:
+        service.running = True
+        await service.create_driver()
+        try:
+            await bench_probe(service, site, args.rounds)
+            await bench_ticks(service, site, args.ticks)
+            await bench_transitions(service, site)
+            await bench_lesson_chain(service, site, args.pages, args.delay)
+        finally:
+            await service.stop()
+            await bot.outbox.flush()
+            service.executor.shutdown()
+
+    print(f"\n{len(bot.log_channel.messages)} notifications sent to the fake channel")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
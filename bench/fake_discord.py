@@ -0,0 +1,44 @@
+import asyncio
+
+from services.notification_service import NotificationOutbox
+from utils.logger import Logger
+
+
+class FakeChannel:
+    """Stands in for the Discord log channel and records what is sent to it."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append(content)
+
+
+class FakeMessage:
+    def __init__(self, content, channel):
+        self.content = content
+        self.channel = channel
+        self.author = "benchmark"
+
+
+class FakeBot:
+    """The parts of TooCoolTrafficSchoolBot that WebDriverService relies on.
+
+    Prompts for answers are replied to immediately with `reply`.
+    """
+
+    def __init__(self, reply="1"):
+        self.user = "bot"
+        self.reply = reply
+        self.closed = False
+        self.logger = Logger()
+        self.log_channel = FakeChannel()
+        self.outbox = NotificationOutbox(self)
+        self.outbox.ready.set()
+
+    async def wait_for(self, event, check=None, timeout=None):
+        await asyncio.sleep(0)
+        return FakeMessage(self.reply, self.log_channel)
+
+    async def close(self):
+        self.closed = True
@@ -1,54 +1,139 @@
+from utils.startup_profile import startup
+
+import asyncio
 import discord
 from discord.ext import commands
-import os
+from pathlib import Path
 import sys
 
+from services.notification_service import NotificationOutbox
 from services.webdriver_service import WebDriverService
+from services.worker_proxy import WorkerProxy
 from utils.logger import Logger
+from utils.process_stats import client_memory
 from config.config import Config
 
-intents = discord.Intents.all()
+startup.mark("imports")
+
+COMMANDS_DIR = Path(__file__).resolve().parent / "commands"
+
+
+def client_options():
+    """Returns the intents and cache options for the Discord client."""
+    if not Config.LOW_MEMORY:
+        return {"intents": discord.Intents.all()}
+
+    # commands and answers are guild messages, guilds fills the channel cache
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    intents.message_content = True
+    return {
+        "intents": intents,
+        "member_cache_flags": discord.MemberCacheFlags.none(),
+        "chunk_guilds_at_startup": False,
+        # discord.py treats 0 as the default of 1000, None disables the cache
+        "max_messages": Config.MESSAGE_CACHE_SIZE or None,
+    }
 
 class TooCoolTrafficSchoolBot(commands.Bot):
     def __init__(self):
-        super().__init__(command_prefix="!", intents=intents, help_command=None)
+        super().__init__(command_prefix="!", help_command=None, **client_options())
 
-        self.driver = WebDriverService(self)
+        if Config.SPLIT_PROCESS:
+            self.driver = WorkerProxy(self)
+        else:
+            self.driver = WebDriverService(self)
+        self.outbox = NotificationOutbox(self)
         self.logger = Logger()
 
     async def setup_hook(self):
+        self.outbox.start()
+
+        # Chrome and the login run (or the worker is reached) while the gateway
+        # connection is made
+        self.driver.prepare()
+
         self.logger.info("Loading cogs...")
 
-        for filename in os.listdir("src/commands"):
-            if filename.endswith(".py") and filename != "__init__.py":
-                try:
-                    await self.load_extension(f"commands.{filename[:-3]}")
-                    self.logger.success(f"Loaded cog: {filename}")
-                except Exception as e:
-                    self.logger.error(f"Failed to load cog {filename}: {e}")
+        await asyncio.gather(
+            *(
+                self.load_cog(path.stem)
+                for path in sorted(COMMANDS_DIR.glob("*.py"))
+                if path.name != "__init__.py"
+            )
+        )
+        startup.mark("cogs loaded")
 
         self.logger.success("Cogs loaded successfully.")
 
+    async def load_cog(self, name):
+        try:
+            await self.load_extension(f"commands.{name}")
+            self.logger.success("Loaded cog: %s", name)
+        except Exception as e:
+            self.logger.error("Failed to load cog %s: %s", name, e)
+
     async def on_ready(self):
-        self.logger.success(f"Logged in as {self.user.name}")
+        startup.mark("gateway ready")
+        self.logger.success("Logged in as %s", self.user.name)
 
-        for guild in self.guilds:
-            for channel in guild.text_channels:
+        if not hasattr(self, "log_channel"):
+            channel = await self.find_log_channel()
+            if channel is not None:
                 self.log_channel = channel
-                break
-            if hasattr(self, "log_channel"):
-                break
+
+        memory = client_memory(self)
+        rss = "unknown"
+        if memory["rss"] is not None:
+            rss = f"{memory['rss'] / 1024**2:.1f} MB"
+        self.logger.info(
+            "Memory: %s RSS, %d guilds, %d channels, %d members, "
+            "%d messages cached",
+            rss,
+            memory["guilds"],
+            memory["channels"],
+            memory["members"],
+            memory["messages"],
+        )
+
+        if Config.SPLIT_PROCESS:
+            # the first tick happens in the worker, which logs its own timings
+            startup.report(self.logger)
 
         if hasattr(self, "log_channel"):
-            await self.log_channel.send("```✅ TooCoolTrafficSchool Bot is online```")
-            await self.log_channel.send("```🚗 Starting the driver...```")
+            self.outbox.ready.set()
+            self.outbox.send("```✅ TooCoolTrafficSchool Bot is online```")
+            self.outbox.send("```🚗 Starting the driver...```")
         else:
             self.logger.error(
                 "No available text channel found for logging. Make sure the bot is in a server with at least one text channel."
             )
             sys.exit(1)
 
-        await self.driver.run()
+        # a worker runs the automation loop from the moment it starts, so a
+        # (re)connecting bot must not ask it to start again
+        if not Config.SPLIT_PROCESS:
+            await self.driver.run()
+
+    async def find_log_channel(self):
+        """Returns the configured log channel, or the first text channel found."""
+        if Config.LOG_CHANNEL_ID:
+            channel = self.get_channel(Config.LOG_CHANNEL_ID)
+            if channel is not None:
+                return channel
+            try:
+                return await self.fetch_channel(Config.LOG_CHANNEL_ID)
+            except discord.HTTPException as e:
+                self.logger.error(
+                    "Failed to find log channel %s: %s", Config.LOG_CHANNEL_ID, e
+                )
+                return None
+
+        for guild in self.guilds:
+            for channel in guild.text_channels:
+                return channel
+        return None
 
 bot = TooCoolTrafficSchoolBot()
 bot.run(Config.bot_token)
\ No newline at end of file
@@ -1,6 +1,9 @@
 from discord.ext import commands
 import sys
 
+from config.config import Config, settings
+from utils.process_stats import client_memory
+
 
 class BotCommands(commands.Cog):
     def __init__(self, bot):
@@ -8,13 +11,71 @@ class BotCommands(commands.Cog):
 
     @commands.command()
     async def status(self, ctx):
-        await ctx.send("```✅ Bot is online.```")
+        await ctx.send(f"```✅ Bot is online.\n\n{await self.bot.driver.status()}```")
+
+    @commands.command()
+    async def stats(self, ctx):
+        await ctx.send(f"```{await self.bot.driver.stats()}```")
+
+    @commands.command()
+    async def memory(self, ctx):
+        memory = client_memory(self.bot)
+        if memory["rss"] is None:
+            rss = "unknown (psutil is not installed)"
+        else:
+            rss = f"{memory['rss'] / 1024**2:.1f} MB"
+        await ctx.send(
+            f"```Mode:              {'low memory' if Config.LOW_MEMORY else 'default'}\n"
+            f"RSS:               {rss}\n"
+            f"Cached guilds:     {memory['guilds']}\n"
+            f"Cached channels:   {memory['channels']}\n"
+            f"Cached members:    {memory['members']}\n"
+            f"Cached messages:   {memory['messages']}```"
+        )
+
+    @commands.command(name="get")
+    async def get_setting(self, ctx, name: str = None):
+        if name is None:
+            lines = [
+                f"{setting.name:<28}{settings.get(setting.name)!s:<12}"
+                f"{'' if setting.live else '(restart) '}{setting.description}"
+                for setting in settings.settings.values()
+            ]
+            # stay under Discord's 2000 character message limit
+            chunk = []
+            for line in lines:
+                if sum(len(l) + 1 for l in chunk) + len(line) > 1900:
+                    await ctx.send("```" + "\n".join(chunk) + "```")
+                    chunk = []
+                chunk.append(line)
+            await ctx.send("```" + "\n".join(chunk) + "```")
+            return
+
+        try:
+            await ctx.send(f"```{name.upper()} = {settings.get(name)}```")
+        except KeyError as e:
+            await ctx.send(f"```❌ {e.args[0]}```")
+
+    @commands.command(name="set")
+    async def set_setting(self, ctx, name: str, value: str):
+        try:
+            setting, value = settings.set(name, value)
+        except (KeyError, ValueError) as e:
+            await ctx.send(f"```❌ {e.args[0]}```")
+            return
+
+        self.bot.logger.info("Setting %s changed to %s.", setting.name, value)
+        if Config.SPLIT_PROCESS:
+            await self.bot.driver.apply_setting(setting.name, value)
+        note = "" if setting.live else " It takes effect the next time the WebDriver starts."
+        await ctx.send(f"```✅ {setting.name} = {value}.{note}```")
 
     @commands.command()
     async def shutdown(self, ctx):
         self.bot.logger.info("Shutting down...")    
         await self.bot.driver.stop()
         await ctx.send("```🚫 Shutting down...```")
+        await self.bot.outbox.flush()
         await self.bot.close()
         self.bot.logger.success("Shutdown successful.")
         sys.exit(0)
@@ -28,13 +28,19 @@ class HelpCommand(commands.Cog):
 
         embed.add_field(
             name="📸 **Take Screenshot**",
-            value="```!screenshot```Captures a screenshot of the current website.",
+            value=(
+                "```!screenshot [format] [scale]```"
+                "Captures a screenshot of the current website.\n"
+                "**Parameters:**\n"
+                "- `format`: `png`, `jpeg` or `webp` (optional)\n"
+                "- `scale`: Downscale factor between `0.1` and `1` (optional)"
+            ),
             inline=False
         )
 
         embed.add_field(
             name="📄 **Get DOM**",
-            value="```!get_dom```Sends an HTML file containing the current DOM.",
+            value="```!get_dom```Sends a gzipped HTML file containing the current DOM.",
             inline=False
         )
 
@@ -62,6 +68,47 @@ class HelpCommand(commands.Cog):
             inline=False
         )
 
+        embed.add_field(
+            name="📈 **Loop Statistics**",
+            value="```!stats```Shows detector latencies, WebDriver commands and tick rate.",
+            inline=False
+        )
+
+        embed.add_field(
+            name="🎞️ **Replay**",
+            value=(
+                "```!replay [count]```Sends the last page snapshots (DOM and, "
+                "with `RECORDER_SCREENSHOTS`, a screenshot) taken at each page "
+                "change, stall and detector failure as a zip file."
+            ),
+            inline=False
+        )
+
+        embed.add_field(
+            name="⏱️ **Trace**",
+            value=(
+                "```!trace```Sends the spans recorded while `TRACE_ENABLED` is on "
+                "as a Chrome trace for https://ui.perfetto.dev."
+            ),
+            inline=False
+        )
+
+        embed.add_field(
+            name="🧠 **Memory**",
+            value="```!memory```Shows the bot's memory use and Discord cache sizes.",
+            inline=False
+        )
+
+        embed.add_field(
+            name="🔧 **Settings**",
+            value=(
+                "```!get [name]``````!set <name> <value>```"
+                "Shows or changes a setting such as `POLL_CEILING` or `LOG_LEVEL` "
+                "while the bot runs. `!get` lists them all."
+            ),
+            inline=False
+        )
+
         embed.set_footer(text="Use the commands exactly as shown above.")
         await ctx.send(embed=embed)
 
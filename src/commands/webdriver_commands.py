@@ -1,7 +1,10 @@
+import asyncio
+import io
 import discord
 from discord.ext import commands
-from selenium.webdriver.common.by import By
-import os
+
+from config.config import Config
+from utils.compression import gzip_text
 
 
 class WebDriverCommands(commands.Cog):
@@ -13,18 +16,53 @@ class WebDriverCommands(commands.Cog):
         await ctx.send("```⚙️ Getting DOM...```")
 
         dom = await self.bot.driver.get_dom()
+        if dom is None:
+            await ctx.send("```❌ Failed to get the DOM.```")
+            return
 
-        with open("index.html", "w") as f:
-            f.write(dom)
+        compressed = await asyncio.to_thread(gzip_text, dom)
+        await ctx.send(file=discord.File(io.BytesIO(compressed), "index.html.gz"))
 
-        await ctx.send(file=discord.File("index.html"))
+        await ctx.send("```✅ DOM fetched successfully.```")
 
-        os.remove("index.html")
+    @commands.command()
+    async def replay(self, ctx, count: int = 10):
+        count, recordings, archive = await self.bot.driver.replay(count)
+        if archive is None:
+            await ctx.send("```❌ Nothing has been recorded yet.```")
+            return
+
+        limit = ctx.guild.filesize_limit if ctx.guild else 8 * 1024**2
+        if len(archive) > limit:
+            await ctx.send(
+                f"```❌ The last {count} recordings are too large to upload. Ask for fewer.```"
+            )
+            return
+
+        await ctx.send(
+            f"```✅ Last {count} of {recordings} recordings.```",
+            file=discord.File(io.BytesIO(archive), "replay.zip"),
+        )
 
-        await ctx.send("```✅ DOM fetched successfully.```")
+    @commands.command()
+    async def trace(self, ctx):
+        if not Config.TRACE_ENABLED:
+            await ctx.send("```⚙️ Tracing is off. Turn it on with !set TRACE_ENABLED true.```")
+
+        spans, data = await self.bot.driver.trace()
+        if not spans:
+            await ctx.send("```❌ No spans have been recorded.```")
+            return
+
+        await ctx.send(
+            f"```✅ {spans} spans. Open the file in https://ui.perfetto.dev```",
+            file=discord.File(io.BytesIO(data), "trace.json.gz"),
+        )
 
     @commands.command()
     async def click_element(self, ctx, by: str, value: str):
+        from selenium.webdriver.common.by import By
+
         await ctx.send(f"```⚙️ Clicking element: {value}...```")
 
         by_mapping = {
@@ -40,7 +78,7 @@ class WebDriverCommands(commands.Cog):
 
         if by.lower() in by_mapping:
             by = by_mapping[by.lower()]
-            clicked = self.bot.driver.click_element(by, value)
+            clicked = await self.bot.driver.click_element(by, value)
 
             if not clicked:
                 await ctx.send("```❌ Element not found.```")
@@ -50,17 +88,29 @@ class WebDriverCommands(commands.Cog):
             await ctx.send("```❌ Invalid 'by' value.```")
 
     @commands.command()
-    async def screenshot(self, ctx):
+    async def screenshot(
+        self,
+        ctx,
+        image_format: str = None,
+        scale: float = None,
+    ):
+        image_format = image_format or Config.SCREENSHOT_FORMAT
+        scale = Config.SCREENSHOT_SCALE if scale is None else scale
+
         try:
             await ctx.send("```⚙️ Taking a screenshot...```")
 
             if hasattr(self.bot, "driver") and self.bot.driver:
-                screenshot_path = os.path.join(os.getcwd(), "screenshot.png")
-                await self.bot.driver.save_screenshot(screenshot_path)
-
-                await ctx.send(file=discord.File(screenshot_path))
+                image, extension = await self.bot.driver.take_screenshot(
+                    image_format.lower(), scale, Config.SCREENSHOT_QUALITY
+                )
+                if image is None:
+                    await ctx.send("```❌ Failed to take a screenshot.```")
+                    return
 
-                os.remove(screenshot_path)
+                await ctx.send(
+                    file=discord.File(io.BytesIO(image), f"screenshot.{extension}")
+                )
 
                 await ctx.send("```✅ Screenshot taken successfully.```")
             else:
@@ -0,0 +1,65 @@
+"""Compares Chrome CPU and memory usage with the lean browser profile on and off.
+
+Usage: python3 src/compare_profiles.py [url] [--duration SECONDS]
+"""
+import argparse
+import time
+from selenium import webdriver
+
+from config.config import Config
+from services.browser_profile import apply_request_blocking, build_chrome_options
+from utils.logger import Logger
+from utils.process_stats import driver_processes, sample_processes
+
+
+def measure(lean, url, duration, interval, logger):
+    """Loads the page with one profile and averages resource samples over the duration."""
+    driver = webdriver.Chrome(options=build_chrome_options(lean))
+    try:
+        apply_request_blocking(driver, lean)
+        driver.get(url)
+
+        samples = []
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            samples.append(sample_processes(driver_processes(driver), interval))
+            logger.debug("lean=%s sample: %s", lean, samples[-1])
+    finally:
+        driver.quit()
+
+    return {
+        "rss": max(sample["rss"] for sample in samples),
+        "cpu": sum(sample["cpu"] for sample in samples) / len(samples),
+        "processes": max(sample["processes"] for sample in samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", nargs="?", default=Config.course_url)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--interval", type=float, default=2)
+    args = parser.parse_args()
+
+    logger = Logger()
+    results = {}
+    for lean in (False, True):
+        logger.info(
+            "Measuring %s profile for %.0fs...",
+            "lean" if lean else "default",
+            args.duration,
+        )
+        results[lean] = measure(lean, args.url, args.duration, args.interval, logger)
+
+    for lean, result in results.items():
+        logger.success(
+            "%-7s: peak RSS %.0f MiB, avg CPU %.1f%%, %d processes",
+            "lean" if lean else "default",
+            result["rss"] / 2**20,
+            result["cpu"],
+            result["processes"],
+        )
+
+
+if __name__ == "__main__":
+    main()
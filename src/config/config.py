@@ -1,15 +1,24 @@
 import os
 from dotenv import load_dotenv
 
+from config.settings import Settings
+
 load_dotenv()
 
 
 class Config:
-    DEBUG = False # if u change this to true u will get in depth logs
     username = os.getenv("USERNAME")
     password = os.getenv("PASSWORD")
     bot_token = os.getenv("BOT_TOKEN")
     course_url = os.getenv("COURSE_URL")
+    login_url = os.getenv("LOGIN_URL", "https://school.toocooltrafficschool.com/login")
 
     if not username or not password or not bot_token:
         raise ValueError("Please provide all the necessary environment variables.")
+
+
+# the tunable settings (poll intervals, timeouts, log level, ...) are typed and
+# validated in config/settings.py and stored as attributes of Config, they can
+# be changed while the bot runs with !set
+settings = Settings(Config, path=os.getenv("SETTINGS_FILE", "settings.json"))
+settings.load()
@@ -0,0 +1,497 @@
+import json
+import os
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+TYPE_NAMES = {int: "a whole number", float: "a number", str: "text"}
+
+
+class Setting:
+    """A typed, validated configuration value stored as an attribute of Config."""
+
+    def __init__(
+        self,
+        name,
+        type,
+        default,
+        description,
+        minimum=None,
+        maximum=None,
+        choices=None,
+        live=True,
+    ):
+        self.name = name
+        self.type = type
+        self.default = default
+        self.description = description
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+        self.live = live  # False when a change only applies after a restart
+
+    def parse(self, raw):
+        """Converts a raw string or JSON value to the right type and validates it."""
+        if raw is None:
+            return None
+
+        if self.type is bool:
+            if isinstance(raw, bool):
+                return raw
+            text = str(raw).strip().lower()
+            if text in TRUE_VALUES:
+                return True
+            if text in FALSE_VALUES:
+                return False
+            raise ValueError(f"{self.name} must be true or false, got '{raw}'")
+
+        try:
+            value = self.type(str(raw).strip() if self.type is str else raw)
+        except (TypeError, ValueError):
+            raise ValueError(
+                f"{self.name} must be {TYPE_NAMES[self.type]}, got '{raw}'"
+            ) from None
+
+        if self.type is str:
+            value = value.lower() if self.choices else value
+        if self.choices and value not in self.choices:
+            raise ValueError(f"{self.name} must be one of: {', '.join(self.choices)}")
+        if self.minimum is not None and value < self.minimum:
+            raise ValueError(f"{self.name} must be at least {self.minimum}")
+        if self.maximum is not None and value > self.maximum:
+            raise ValueError(f"{self.name} must be at most {self.maximum}")
+        return value
+
+
+SETTINGS = [
+    # automation loop
+    Setting(
+        "EVENT_DRIVEN",
+        bool,
+        True,
+        "Wake the loop on content/URL changes instead of only polling",
+    ),
+    Setting(
+        "POLL_FLOOR",
+        float,
+        0.5,
+        "Shortest delay between ticks (s)",
+        minimum=0.05,
+        maximum=60,
+    ),
+    Setting(
+        "POLL_CEILING",
+        float,
+        30.0,
+        "Longest delay between ticks while the page is unchanged (s)",
+        minimum=0.05,
+        maximum=600,
+    ),
+    Setting(
+        "POLL_BACKOFF",
+        float,
+        1.5,
+        "Delay multiplier after each unchanged tick",
+        minimum=1,
+        maximum=10,
+    ),
+    Setting(
+        "STALL_THRESHOLD",
+        float,
+        180.0,
+        "Alert when the page content hasn't moved on for this long (s)",
+        minimum=10,
+    ),
+    Setting(
+        "ALERT_RESPONSE_TIMEOUT",
+        float,
+        300.0,
+        "Time to answer a validation question before the bot stops (s)",
+        minimum=10,
+    ),
+    Setting(
+        "SIGN_QUIZ_RESPONSE_TIMEOUT",
+        float,
+        60.0,
+        "Time to answer a sign quiz question (s)",
+        minimum=10,
+    ),
+    # recovery
+    Setting(
+        "MAX_RESTARTS",
+        int,
+        5,
+        "Driver restart attempts per failure",
+        minimum=0,
+        maximum=100,
+    ),
+    Setting(
+        "MAX_PAGE_ERRORS",
+        int,
+        3,
+        "Page errors in a row before the driver is restarted",
+        minimum=0,
+        maximum=100,
+    ),
+    Setting(
+        "RESTART_BACKOFF_BASE",
+        float,
+        2.0,
+        "First delay before a driver restart (s)",
+        minimum=0.1,
+        maximum=600,
+    ),
+    Setting(
+        "RESTART_BACKOFF_MAX",
+        float,
+        60.0,
+        "Longest delay before a driver restart (s)",
+        minimum=0.1,
+        maximum=3600,
+    ),
+    Setting(
+        "DRIVER_QUIT_TIMEOUT",
+        float,
+        10.0,
+        "Time allowed for a failed driver to quit (s)",
+        minimum=1,
+        maximum=120,
+    ),
+    # page readiness, waited for after every navigation and click
+    Setting(
+        "NAV_LOAD_TIMEOUT",
+        float,
+        15.0,
+        "Time allowed for a page to finish loading (s)",
+        minimum=1,
+        maximum=300,
+    ),
+    Setting(
+        "NAV_ELEMENT_TIMEOUT",
+        float,
+        10.0,
+        "Time allowed for a page's expected element to appear (s)",
+        minimum=1,
+        maximum=300,
+    ),
+    Setting(
+        "NETWORK_IDLE",
+        float,
+        0.0,
+        "Also wait until no request has finished for this long, 0 to skip (s)",
+        minimum=0,
+        maximum=10,
+    ),
+    Setting(
+        "NAV_IDLE_TIMEOUT",
+        float,
+        5.0,
+        "Time allowed for the network to go idle (s)",
+        minimum=1,
+        maximum=300,
+    ),
+    # resource watchdog
+    Setting(
+        "WATCHDOG_INTERVAL",
+        float,
+        30.0,
+        "Time between Chrome resource samples, 0 turns the watchdog off (s)",
+        minimum=0,
+    ),
+    Setting(
+        "CHROME_MAX_RSS_MB",
+        int,
+        2048,
+        "Recycle Chrome above this much memory, 0 for no limit (MB)",
+        minimum=0,
+    ),
+    Setting(
+        "CHROME_MAX_CPU",
+        float,
+        0.0,
+        "Recycle Chrome above this sustained CPU use, 0 for no limit (%)",
+        minimum=0,
+    ),
+    Setting(
+        "RECYCLE_GRACE",
+        float,
+        300.0,
+        "Longest wait for a new page before recycling anyway (s)",
+        minimum=0,
+    ),
+    # notifications
+    Setting(
+        "OUTBOX_COALESCE_WINDOW",
+        float,
+        0.5,
+        "Time to collect a burst of notifications into one message (s)",
+        minimum=0,
+        maximum=10,
+    ),
+    Setting(
+        "OUTBOX_RATE_LIMIT",
+        int,
+        5,
+        "Messages allowed per rate limit period",
+        minimum=1,
+        live=False,
+    ),
+    Setting(
+        "OUTBOX_RATE_PERIOD",
+        float,
+        5.0,
+        "Rate limit period (s)",
+        minimum=0.1,
+        live=False,
+    ),
+    # screenshots, jpeg/webp and downscaling need Pillow installed
+    Setting(
+        "SCREENSHOT_FORMAT",
+        str,
+        "png",
+        "Default !screenshot format",
+        choices=("png", "jpeg", "webp"),
+    ),
+    Setting(
+        "SCREENSHOT_SCALE",
+        float,
+        1.0,
+        "Default !screenshot downscale factor",
+        minimum=0.1,
+        maximum=1,
+    ),
+    Setting("SCREENSHOT_QUALITY", int, 70, "JPEG/WebP quality", minimum=1, maximum=100),
+    # flight recorder
+    Setting(
+        "RECORDER_BUDGET_MB",
+        float,
+        8.0,
+        "Memory kept for !replay page snapshots, 0 turns recording off (MB)",
+        minimum=0,
+        maximum=1024,
+    ),
+    Setting(
+        "RECORDER_SCREENSHOTS",
+        bool,
+        False,
+        "Add a screenshot to each !replay snapshot",
+    ),
+    Setting(
+        "RECORDER_SCREENSHOT_SCALE",
+        float,
+        0.5,
+        "Downscale factor of !replay screenshots",
+        minimum=0.1,
+        maximum=1,
+    ),
+    # tracing, see !trace
+    Setting(
+        "TRACE_ENABLED",
+        bool,
+        False,
+        "Record a span for every service method and WebDriver command",
+    ),
+    Setting(
+        "TRACE_BUFFER",
+        int,
+        100_000,
+        "Spans kept for !trace, the oldest are dropped",
+        minimum=1000,
+        live=False,
+    ),
+    # logging
+    Setting(
+        "LOG_LEVEL",
+        str,
+        "info",
+        "Lowest level written to the log",
+        choices=("debug", "info", "warning", "error"),
+    ),
+    Setting("LOG_FILE", str, None, "Optional JSON-lines log file", live=False),
+    Setting(
+        "LOG_FILE_MAX_BYTES",
+        int,
+        5 * 1024 * 1024,
+        "Size at which the log file is rotated",
+        minimum=1024,
+        live=False,
+    ),
+    Setting(
+        "LOG_FILE_BACKUPS",
+        int,
+        3,
+        "Rotated log files to keep",
+        minimum=0,
+        live=False,
+    ),
+    # discord client, applied when the bot is restarted
+    Setting(
+        "LOW_MEMORY",
+        bool,
+        False,
+        "Request only the intents the bot uses and skip member caching",
+        live=False,
+    ),
+    Setting(
+        "MESSAGE_CACHE_SIZE",
+        int,
+        100,
+        "Messages kept in the client cache (low memory mode only)",
+        minimum=0,
+        live=False,
+    ),
+    Setting(
+        "LOG_CHANNEL_ID",
+        int,
+        None,
+        "Channel to log to, instead of the first text channel found",
+        live=False,
+    ),
+    # split process mode, the browser runs in `python3 src/worker.py`
+    Setting(
+        "SPLIT_PROCESS",
+        bool,
+        False,
+        "Run the browser in a separate worker process",
+        live=False,
+    ),
+    Setting(
+        "WORKER_HOST",
+        str,
+        "127.0.0.1",
+        "Address the browser worker listens on",
+        live=False,
+    ),
+    Setting(
+        "WORKER_PORT",
+        int,
+        8765,
+        "Port the browser worker listens on",
+        minimum=1,
+        maximum=65535,
+        live=False,
+    ),
+    Setting(
+        "WORKER_TIMEOUT",
+        float,
+        30.0,
+        "Time a command waits for the browser worker to connect (s)",
+        minimum=1,
+    ),
+    # browser, applied when Chrome is (re)started
+    Setting(
+        "DRIVER_BACKEND",
+        str,
+        "selenium",
+        "Driver backend",
+        choices=("selenium", "cdp"),
+        live=False,
+    ),
+    Setting("LEAN_BROWSER", bool, False, "Use the lean Chrome profile", live=False),
+    Setting(
+        "HEADLESS",
+        bool,
+        False,
+        "Run Chrome headless (lean profile only)",
+        live=False,
+    ),
+    Setting(
+        "WINDOW_SIZE",
+        str,
+        "1024,768",
+        "Chrome window size (lean profile only)",
+        live=False,
+    ),
+    Setting("BLOCK_IMAGES", bool, True, "Block images (lean profile only)", live=False),
+    Setting(
+        "BLOCK_FONTS",
+        bool,
+        True,
+        "Block web fonts (lean profile only)",
+        live=False,
+    ),
+    Setting(
+        "BLOCK_MEDIA",
+        bool,
+        False,
+        "Block audio/video, some lessons may need it (lean profile only)",
+        live=False,
+    ),
+    Setting(
+        "CHROME_PROFILE_DIR",
+        str,
+        None,
+        "Keep the Chrome profile (and its login) in this directory",
+        live=False,
+    ),
+]
+
+
+class Settings:
+    """Loads, validates and updates the settings stored on the Config class.
+
+    Values come from the environment (including .env), overridden by the JSON
+    file named by SETTINGS_FILE when it exists. Changes made with set() are
+    written back to that file so they survive a restart.
+    """
+
+    def __init__(self, target, settings=SETTINGS, path=None):
+        self.target = target
+        self.settings = {setting.name: setting for setting in settings}
+        self.path = path
+
+    def lookup(self, name):
+        setting = self.settings.get(name.upper())
+        if setting is None:
+            raise KeyError(f"Unknown setting '{name}'")
+        return setting
+
+    def read_file(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        with open(self.path, encoding="utf-8") as f:
+            return {key.upper(): value for key, value in json.load(f).items()}
+
+    def load(self):
+        """Applies the environment and the settings file to the target."""
+        overrides = self.read_file()
+        for name, setting in self.settings.items():
+            raw = overrides.get(name, os.getenv(name))
+            value = setting.default if raw is None else setting.parse(raw)
+            setattr(self.target, name, value)
+        self.check(self.values())
+
+    def check(self, values):
+        """Validates rules that involve more than one setting."""
+        if values["POLL_FLOOR"] > values["POLL_CEILING"]:
+            raise ValueError("POLL_FLOOR must not be greater than POLL_CEILING")
+        if values["RESTART_BACKOFF_BASE"] > values["RESTART_BACKOFF_MAX"]:
+            raise ValueError(
+                "RESTART_BACKOFF_BASE must not be greater than RESTART_BACKOFF_MAX"
+            )
+
+    def values(self):
+        return {name: getattr(self.target, name) for name in self.settings}
+
+    def get(self, name):
+        return getattr(self.target, self.lookup(name).name)
+
+    def set(self, name, raw):
+        """Validates and applies a new value. Returns the setting and its new value."""
+        setting = self.lookup(name)
+        value = setting.parse(raw)
+
+        values = self.values()
+        values[setting.name] = value
+        self.check(values)
+
+        setattr(self.target, setting.name, value)
+        self.save(setting.name, value)
+        return setting, value
+
+    def save(self, name, value):
+        if not self.path:
+            return
+        overrides = self.read_file()
+        overrides[name] = value
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(overrides, f, indent=4, sort_keys=True)
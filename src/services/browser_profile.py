@@ -0,0 +1,63 @@
+import os
+from config.config import Config
+
+# resources the lean profile refuses to download
+BLOCKED_FONT_URLS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+BLOCKED_MEDIA_URLS = ["*.mp4", "*.webm", "*.m4v", "*.mp3", "*.m3u8"]
+
+
+def build_chrome_options(lean=None):
+    """Builds the Chrome options, trimmed down when the lean profile is enabled."""
+    from selenium.webdriver.chrome.options import Options
+
+    if lean is None:
+        lean = Config.LEAN_BROWSER
+
+    options = Options()
+    options.add_argument("--mute-audio")
+    if Config.CHROME_PROFILE_DIR:
+        options.add_argument(
+            f"--user-data-dir={os.path.abspath(Config.CHROME_PROFILE_DIR)}"
+        )
+
+    if not lean:
+        return options
+
+    if Config.HEADLESS:
+        options.add_argument("--headless=new")
+    options.add_argument(f"--window-size={Config.WINDOW_SIZE}")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+    options.add_argument("--no-first-run")
+    # the course timers must keep ticking while the window is hidden or headless
+    options.add_argument("--disable-background-timer-throttling")
+    options.add_argument("--disable-backgrounding-occluded-windows")
+    options.add_argument("--disable-renderer-backgrounding")
+
+    if Config.BLOCK_IMAGES:
+        options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+
+    return options
+
+
+def apply_request_blocking(driver, lean=None):
+    """Blocks font and media downloads through the DevTools network domain."""
+    if lean is None:
+        lean = Config.LEAN_BROWSER
+
+    patterns = []
+    if lean and Config.BLOCK_FONTS:
+        patterns += BLOCKED_FONT_URLS
+    if lean and Config.BLOCK_MEDIA:
+        patterns += BLOCKED_MEDIA_URLS
+    if not patterns:
+        return
+
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
@@ -0,0 +1,124 @@
+import base64
+import json
+
+
+class SeleniumBackend:
+    """Drives Chrome through the WebDriver HTTP protocol.
+
+    Every method blocks, so the service only calls them on the driver thread.
+    Element handles returned by scripts are Selenium WebElements in every
+    backend, so clicks and hovers always go through `driver`.
+    """
+
+    name = "selenium"
+
+    def __init__(self):
+        self.driver = None
+
+    def start(self, options):
+        from selenium import webdriver
+
+        self.driver = webdriver.Chrome(options=options)
+        return self.driver
+
+    def quit(self):
+        self.driver.quit()
+        self.driver = None
+
+    def get(self, url):
+        self.driver.get(url)
+
+    def title(self):
+        return self.driver.title
+
+    def current_url(self):
+        return self.driver.current_url
+
+    def page_source(self):
+        return self.driver.page_source
+
+    def screenshot(self, image_format="png", quality=None):
+        """Returns the screenshot bytes and the format they are encoded in."""
+        return self.driver.get_screenshot_as_png(), "png"
+
+    def execute_script(self, script, *args):
+        return self.driver.execute_script(script, *args)
+
+    def execute_async_script(self, script, *args):
+        return self.driver.execute_async_script(script, *args)
+
+
+class CdpBackend(SeleniumBackend):
+    """Sends reads and screenshots as Chrome DevTools Protocol calls.
+
+    Reads are evaluated with Runtime.evaluate and screenshots come from
+    Page.captureScreenshot, which can encode JPEG/WebP in the browser.
+    Every CDP command still goes through chromedriver, one HTTP round trip
+    each like a WebDriver command, so compare the two with the bench's
+    --backend option rather than expecting lower latency. Scripts that
+    return element handles, such as the page probe, still go through
+    WebDriver.
+    """
+
+    name = "cdp"
+
+    def cdp(self, command, **params):
+        return self.driver.execute_cdp_cmd(command, params)
+
+    def evaluate(self, expression):
+        result = self.cdp(
+            "Runtime.evaluate",
+            expression=expression,
+            returnByValue=True,
+            awaitPromise=True,
+        )
+        if "exceptionDetails" in result:
+            from selenium.common.exceptions import JavascriptException
+
+            details = result["exceptionDetails"]
+            raise JavascriptException(
+                details.get("exception", {}).get("description", details.get("text"))
+            )
+        return result["result"].get("value")
+
+    def title(self):
+        return self.evaluate("document.title")
+
+    def current_url(self):
+        return self.evaluate("window.location.href")
+
+    def page_source(self):
+        return self.evaluate("document.documentElement.outerHTML")
+
+    def screenshot(self, image_format="png", quality=None):
+        image_format = "jpeg" if image_format == "jpg" else image_format
+        if image_format not in ("png", "jpeg", "webp"):
+            image_format = "png"
+
+        params = {"format": image_format}
+        if quality is not None and image_format != "png":
+            params["quality"] = quality
+        data = self.cdp("Page.captureScreenshot", **params)["data"]
+        return base64.b64decode(data), image_format
+
+    def execute_async_script(self, script, *args):
+        # the callback Selenium would append becomes the promise's resolve
+        arguments = json.dumps(list(args))
+        return self.evaluate(
+            "new Promise((done) => (function () {"
+            f"{script}"
+            f"}}).apply(null, {arguments}.concat([done])))"
+        )
+
+
+BACKENDS = {backend.name: backend for backend in (SeleniumBackend, CdpBackend)}
+
+
+def create_backend(name):
+    """Creates the driver backend registered under the given name."""
+    try:
+        return BACKENDS[name.lower()]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown driver backend '{name}'. Choose from: {', '.join(BACKENDS)}"
+        ) from None
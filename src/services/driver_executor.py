@@ -0,0 +1,31 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DriverExecutor:
+    """Runs blocking WebDriver calls on a single dedicated worker thread."""
+
+    def __init__(self):
+        self.executor = None
+
+    def start(self):
+        """Starts the worker thread if it is not already running."""
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="webdriver"
+            )
+
+    async def call(self, func, *args, **kwargs):
+        """Runs func on the driver thread and awaits its result."""
+        self.start()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self):
+        """Stops the worker thread once any queued calls have finished."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
@@ -0,0 +1,123 @@
+import asyncio
+import io
+import json
+import time
+import zipfile
+from collections import deque
+from config.config import Config
+from utils.compression import encode_screenshot, gzip_text
+
+
+class Recording:
+    """One snapshot of the page: its gzipped DOM and an optional screenshot."""
+
+    def __init__(self, reason, url, title, dom, screenshot=None, extension=None):
+        self.timestamp = time.time()
+        self.reason = reason
+        self.url = url
+        self.title = title
+        self.dom = dom
+        self.screenshot = screenshot
+        self.extension = extension
+
+    @property
+    def size(self):
+        return len(self.dom) + len(self.screenshot or b"")
+
+
+class FlightRecorder:
+    """Keeps the latest page snapshots in memory for post-mortems.
+
+    A snapshot is taken at every page transition, when a detector fails and
+    when the course stalls. A failure that repeats on the same page is only
+    recorded once. The oldest snapshots are evicted once the buffer goes over
+    RECORDER_BUDGET_MB, so the state that led to a stall is still there when
+    !replay is asked for.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.recordings = deque()
+        self.size = 0
+        # the page each reason was last recorded on
+        self.last_pages = {}
+
+    def add(self, recording):
+        self.recordings.append(recording)
+        self.size += recording.size
+        budget = Config.RECORDER_BUDGET_MB * 2**20
+        while self.size > budget and len(self.recordings) > 1:
+            self.size -= self.recordings.popleft().size
+
+    async def capture(self, reason, state=None):
+        """Records the current page. Failures are logged, never raised."""
+        if not Config.RECORDER_BUDGET_MB or self.service.backend is None:
+            return
+        page = (state["url"], state["content_hash"]) if state else None
+        if page is not None and self.last_pages.get(reason) == page:
+            return
+
+        service = self.service
+        try:
+            dom = await service.call(service.backend.page_source)
+            screenshot = extension = None
+            if Config.RECORDER_SCREENSHOTS:
+                image, source_format = await service.call(
+                    service.backend.screenshot, "jpeg", Config.SCREENSHOT_QUALITY
+                )
+                screenshot, extension = await asyncio.to_thread(
+                    encode_screenshot,
+                    image,
+                    "jpeg",
+                    Config.RECORDER_SCREENSHOT_SCALE,
+                    Config.SCREENSHOT_QUALITY,
+                    source_format,
+                )
+            compressed = await asyncio.to_thread(gzip_text, dom)
+        except Exception as e:
+            service.bot.logger.debug("Failed to record the page (%s): %s", reason, e)
+            return
+
+        self.add(
+            Recording(
+                reason,
+                state["url"] if state else None,
+                state["title"] if state else None,
+                compressed,
+                screenshot,
+                extension,
+            )
+        )
+        self.last_pages[reason] = page
+        service.bot.logger.debug(
+            "Recorded the page (%s), %d recordings in %.1f MB.",
+            reason,
+            len(self.recordings),
+            self.size / 2**20,
+        )
+
+    def archive(self, count):
+        """Packs the last `count` recordings into a zip file, oldest first."""
+        recordings = list(self.recordings)[-count:]
+        buffer = io.BytesIO()
+        index = []
+        # the DOMs and screenshots are compressed already
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+            for number, recording in enumerate(recordings, start=1):
+                prefix = f"{number:03d}"
+                entry = {
+                    "file": f"{prefix}.html.gz",
+                    "time": time.strftime(
+                        "%Y-%m-%d %H:%M:%S", time.localtime(recording.timestamp)
+                    ),
+                    "reason": recording.reason,
+                    "url": recording.url,
+                    "title": recording.title,
+                }
+                archive.writestr(entry["file"], recording.dom)
+                if recording.screenshot is not None:
+                    entry["screenshot"] = f"{prefix}.{recording.extension}"
+                    archive.writestr(entry["screenshot"], recording.screenshot)
+                index.append(entry)
+            archive.writestr("index.json", json.dumps(index, indent=4))
+        return buffer.getvalue()
@@ -0,0 +1,71 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+from config.config import Config
+
+# screenshots, DOMs and replay archives travel base64-encoded inside one line
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+
+
+def auth_token():
+    """Derives the shared secret both processes prove they know from BOT_TOKEN."""
+    return hashlib.sha256(f"worker:{Config.bot_token}".encode("utf-8")).hexdigest()
+
+
+def check_token(token):
+    return isinstance(token, str) and hmac.compare_digest(token, auth_token())
+
+
+def encode(value):
+    """Makes a result JSON-safe, wrapping bytes and turning tuples into lists."""
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    return value
+
+
+def decode(value):
+    if isinstance(value, dict) and "__bytes__" in value:
+        return base64.b64decode(value["__bytes__"])
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    return value
+
+
+class Channel:
+    """Newline-delimited JSON messages over a local stream connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, host, port):
+        reader, writer = await asyncio.open_connection(
+            host, port, limit=MAX_MESSAGE_BYTES
+        )
+        return cls(reader, writer)
+
+    async def send(self, message):
+        data = json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+        async with self.lock:
+            self.writer.write(data)
+            await self.writer.drain()
+
+    async def receive(self):
+        """Returns the next message, or None once the other side has gone."""
+        line = await self.reader.readline()
+        if not line:
+            return None
+        return json.loads(line)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
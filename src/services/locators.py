@@ -0,0 +1,88 @@
+import json
+
+
+class Locator:
+    """Where to find one element the detectors click.
+
+    Each locator is compiled to the cheapest lookup that finds its element:
+    getElementById, then querySelector, then a text match over the elements
+    a CSS selector narrows it down to. XPath is never used.
+    """
+
+    def __init__(self, name, element_id=None, css=None, text=None):
+        if not element_id and not css:
+            raise ValueError(f"Locator '{name}' needs an id or a CSS selector")
+        self.name = name
+        self.element_id = element_id
+        self.css = css
+        self.text = text
+
+    def compile(self):
+        """Returns a JavaScript expression that evaluates to the element or null."""
+        if self.element_id:
+            return f"document.getElementById({json.dumps(self.element_id)})"
+        if self.text is None:
+            return f"document.querySelector({json.dumps(self.css)})"
+        return f"findByText({json.dumps(self.css)}, {json.dumps(self.text)})"
+
+
+# named after the probe state keys they fill, see PAGE_PROBE_SCRIPT
+LOCATORS = (
+    Locator("still_here_button", css="button", text="I'm Still Here"),
+    Locator("next_button", element_id="next-button"),
+    Locator("resume_chapter_button", css="span", text="Resume Chapter"),
+    Locator("start_chapter_button", css="span", text="Start Chapter"),
+    Locator("quiz_answer", css="label[data-correct='yes']"),
+)
+
+
+def compile_locators(locators=LOCATORS):
+    """Builds the probe's `find(name)` helper from the locator registry.
+
+    `find` reuses the handle passed in `cached` while it is still attached to
+    the document and only searches the page when it is not.
+    """
+    lookups = ",\n".join(
+        f"    {json.dumps(locator.name)}: () => {locator.compile()}"
+        for locator in locators
+    )
+    return f"""
+const findByText = (selector, text) => {{
+    for (const el of document.querySelectorAll(selector)) {{
+        if (el.textContent.includes(text)) return el;
+    }}
+    return null;
+}};
+const lookups = {{
+{lookups},
+}};
+const find = (name) => {{
+    const el = cached[name];
+    return el && el.isConnected ? el : lookups[name]();
+}};
+"""
+
+
+class ElementCache:
+    """Element handles found by the probe on the current page.
+
+    Handles are kept until the page navigates, a detector acts on it, or
+    Chrome reports one of them as stale.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.url = None
+        self.elements = {}
+
+    def update(self, state):
+        """Stores the handles found by a probe, dropping them after navigation."""
+        if state["url"] != self.url:
+            self.elements = {}
+            self.url = state["url"]
+        for locator in LOCATORS:
+            element = state.get(locator.name)
+            if element is not None:
+                self.elements[locator.name] = element
@@ -0,0 +1,109 @@
+import bisect
+import time
+
+
+class Histogram:
+    """Fixed-bucket latency histogram, recorded in seconds."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent):
+        """Returns the upper bound of the bucket holding the given percentile."""
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                if index < len(self.BUCKETS):
+                    return min(self.BUCKETS[index], self.max)
+                return self.max
+        return self.max
+
+
+def count_webdriver_commands(driver, metrics):
+    """Counts every WebDriver command the driver sends.
+
+    Element methods such as click() and CDP commands go through the same
+    `execute`, so a call that sends several commands counts each of them.
+    """
+    execute = driver.execute
+
+    def counted_execute(driver_command, params=None):
+        metrics.record_webdriver_command()
+        return execute(driver_command, params)
+
+    driver.execute = counted_execute
+
+
+class Metrics:
+    """Collects timing and throughput figures for the automation loop.
+
+    Pages are counted by the ProgressTracker, so !stats and !status agree.
+    """
+
+    def __init__(self, progress):
+        self.progress = progress
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.detectors = {}
+        self.ticks = Histogram()
+        self.webdriver_commands = 0
+        self.tick_webdriver_commands = 0
+
+    def record_webdriver_command(self):
+        self.webdriver_commands += 1
+
+    def record_detector(self, name, seconds):
+        self.detectors.setdefault(name, Histogram()).record(seconds)
+
+    def record_tick(self, seconds, webdriver_commands):
+        self.ticks.record(seconds)
+        self.tick_webdriver_commands += webdriver_commands
+
+    def summary(self):
+        """Formats the collected metrics as a plain-text table."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        ticks = self.ticks.count
+        lines = [
+            f"Uptime:            {elapsed / 60:.1f} min",
+            f"Ticks:             {ticks} ({ticks / elapsed:.2f}/s)",
+            f"Tick latency:      mean {self.ticks.mean * 1000:.0f} ms, "
+            f"p95 ≤{self.ticks.percentile(95) * 1000:.0f} ms, "
+            f"max {self.ticks.max * 1000:.0f} ms",
+            f"Driver commands:   {self.webdriver_commands} "
+            f"({self.tick_webdriver_commands / ticks if ticks else 0:.1f}/tick)",
+            f"Page advances:     {self.progress.pages} "
+            f"({self.progress.pages_per_hour():.1f}/h)",
+            "",
+            f"{'Detector':<26}{'count':>7}{'mean':>9}{'p95':>9}{'max':>9}",
+        ]
+        for name, histogram in sorted(
+            self.detectors.items(), key=lambda item: item[1].total, reverse=True
+        ):
+            lines.append(
+                f"{name:<26}{histogram.count:>7}"
+                f"{histogram.mean * 1000:>7.0f}ms"
+                f"{histogram.percentile(95) * 1000:>7.0f}ms"
+                f"{histogram.max * 1000:>7.0f}ms"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,96 @@
+import asyncio
+from config.config import Config
+from utils.tracer import tracer
+
+
+class RateLimiter:
+    """Token bucket matching Discord's per-channel message bucket."""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity
+        self.updated = None
+
+    async def acquire(self):
+        """Waits until a message may be sent without hitting the rate limit."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self.updated is not None:
+                refill = (now - self.updated) * self.capacity / self.period
+                self.tokens = min(self.capacity, self.tokens + refill)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) * self.period / self.capacity)
+
+
+class NotificationOutbox:
+    """Queues log channel messages and sends them in coalesced batches.
+
+    Messages queued within a short window of each other are merged into as
+    few Discord messages as possible and sent from a background task, so
+    callers never wait on the Discord API. Nothing is sent until the bot sets
+    `ready`, so messages can be queued before the log channel is known.
+    """
+
+    MAX_MESSAGE_LENGTH = 2000
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.queue = asyncio.Queue()
+        self.limiter = RateLimiter(
+            Config.OUTBOX_RATE_LIMIT, Config.OUTBOX_RATE_PERIOD
+        )
+        self.ready = asyncio.Event()
+        self.task = None
+
+    def start(self):
+        """Starts the background sender if it is not already running."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._worker())
+
+    def send(self, content):
+        """Queues a message for the log channel without waiting for it to be sent."""
+        self.queue.put_nowait(content)
+
+    async def flush(self):
+        """Waits until every queued message has been sent."""
+        if self.task is not None and not self.task.done():
+            await self.queue.join()
+
+    def _merge(self, contents):
+        """Merges queued messages into as few Discord messages as possible."""
+        batches = []
+        for content in contents:
+            if batches and (
+                len(batches[-1]) + 1 + len(content) <= self.MAX_MESSAGE_LENGTH
+            ):
+                batches[-1] = f"{batches[-1]}\n{content}"
+            else:
+                batches.append(content)
+        return batches
+
+    async def _worker(self):
+        while True:
+            contents = [await self.queue.get()]
+            await self.ready.wait()
+
+            # give the rest of a burst a moment to arrive before sending
+            await asyncio.sleep(Config.OUTBOX_COALESCE_WINDOW)
+            while not self.queue.empty():
+                contents.append(self.queue.get_nowait())
+
+            try:
+                for batch in self._merge(contents):
+                    await self.limiter.acquire()
+                    with tracer.span("log_channel.send", "discord"):
+                        await self.bot.log_channel.send(batch)
+            except Exception as e:
+                self.bot.logger.error("Failed to send notification: %s", e)
+            finally:
+                for _ in contents:
+                    self.queue.task_done()
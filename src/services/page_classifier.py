@@ -0,0 +1,116 @@
+import re
+from config.config import Config
+
+
+class PageType:
+    COURSE_INDEX = "course index"
+    LESSON = "lesson"
+    QUIZ = "quiz"
+    SIGN_QUIZ = "sign quiz"
+    VALIDATION_QUESTION = "validation question"
+    LOCKED_OUT = "locked out"
+
+
+# the detectors worth running on each page type, in the order they run. Every
+# type keeps check_progress so a stall is always reported, and the question
+# types keep the buttons so a page whose question stays in the DOM still moves on
+PAGE_DETECTORS = {
+    PageType.LOCKED_OUT: ("check_locked_out", "check_progress"),
+    PageType.VALIDATION_QUESTION: (
+        "check_alert",
+        "check_locked_out",
+        "check_still_here_button",
+        "check_next_button",
+        "check_progress",
+    ),
+    PageType.SIGN_QUIZ: (
+        "check_locked_out",
+        "check_quiz",
+        "check_still_here_button",
+        "check_next_button",
+        "check_progress",
+    ),
+    PageType.QUIZ: (
+        "check_alert",
+        "check_locked_out",
+        "check_quiz",
+        "check_still_here_button",
+        "check_next_button",
+        "check_progress",
+    ),
+    PageType.COURSE_INDEX: (
+        "check_locked_out",
+        "check_chapter_button",
+        "check_progress",
+    ),
+    PageType.LESSON: (
+        "check_alert",
+        "check_locked_out",
+        "check_still_here_button",
+        "check_next_button",
+        "check_progress",
+    ),
+}
+
+# the probe sections each detector reads, see page_probe.PROBE_SECTIONS
+DETECTOR_SECTIONS = {
+    "check_alert": ("alert",),
+    "check_locked_out": ("lockout",),
+    "check_quiz": ("quiz", "sign_quiz"),
+    "check_still_here_button": ("still_here",),
+    "check_next_button": ("next",),
+    "check_chapter_button": ("chapter",),
+    "check_progress": (),
+}
+
+QUIZ_URL_PATTERN = re.compile(r"quiz|exam", re.IGNORECASE)
+
+
+def probe_sections(page_type):
+    """Returns the probe sections needed by the detectors of a page type."""
+    sections = []
+    for detector in PAGE_DETECTORS[page_type]:
+        for section in DETECTOR_SECTIONS[detector]:
+            if section not in sections:
+                sections.append(section)
+    return sections
+
+
+class PageClassifier:
+    """Classifies pages from their URL and the probe's markers.
+
+    The result is cached until the URL, title or markers change, or until a
+    detector interacts with the page and calls reset().
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.key = None
+        self.page_type = None
+
+    def classify(self, state):
+        """Returns the page type and whether it was (re)classified for this state."""
+        markers = state["markers"]
+        # markers catch questions injected into a page that was already classified
+        key = (state["url"], state["title"], tuple(sorted(markers.items())))
+        if key == self.key:
+            return self.page_type, False
+
+        if markers["lockout"]:
+            page_type = PageType.LOCKED_OUT
+        elif markers["validation"]:
+            page_type = PageType.VALIDATION_QUESTION
+        elif markers["sign_quiz"]:
+            page_type = PageType.SIGN_QUIZ
+        elif state["url"] == Config.course_url:
+            page_type = PageType.COURSE_INDEX
+        elif markers["quiz"] or QUIZ_URL_PATTERN.search(state["url"]):
+            page_type = PageType.QUIZ
+        else:
+            page_type = PageType.LESSON
+
+        self.key = key
+        self.page_type = page_type
+        return page_type, True
@@ -0,0 +1,210 @@
+from services.locators import compile_locators
+
+# every section the probe knows how to read, see PAGE_PROBE_SCRIPT
+PROBE_SECTIONS = (
+    "lockout",
+    "alert",
+    "quiz",
+    "sign_quiz",
+    "still_here",
+    "next",
+    "chapter",
+)
+
+# the part of the page whose text counts as its content; digits and whitespace
+# are left out so countdown timers neither count as progress nor wake the loop
+CONTENT_SCRIPT = """
+const contentText = () => {
+    const region = document.querySelector("main, #content, .content, article")
+        || document.body;
+    return region ? region.textContent.replace(/\\s+|\\d+/g, "") : "";
+};
+"""
+
+# arguments[0] lists the sections to read (all of them when null); the cheap
+# page markers are always returned so the page can be classified from any probe.
+# arguments[1] maps locator names to handles cached from earlier probes
+PAGE_PROBE_SCRIPT = """
+const sections = arguments[0] ? new Set(arguments[0]) : null;
+const cached = arguments[1] || {};
+const wants = (section) => sections === null || sections.has(section);
+""" + compile_locators() + CONTENT_SCRIPT + """
+const text = (el) => (el ? el.innerText.trim() : null);
+
+const content = contentText();
+let contentHash = 0x811c9dc5;
+for (let i = 0; i < content.length; i++) {
+    contentHash = Math.imul(contentHash ^ content.charCodeAt(i), 0x01000193);
+}
+
+const pageUrl = new URL(window.location.href);
+const pageNumber = pageUrl.searchParams.get("page")
+    || (pageUrl.pathname.match(/(\\d+)\\/?$/) || [])[1];
+
+const state = {
+    title: document.title,
+    url: window.location.href,
+    content_hash: contentHash >>> 0,
+    page_index: pageNumber ? Number(pageNumber) : null,
+    markers: {
+        lockout: document.getElementById("myLockoutModal") !== null,
+        validation: document.querySelector(".questionLabel") !== null,
+        quiz: document.getElementById("quiz-answer-group") !== null,
+        sign_quiz: document.querySelector(".question-sign") !== null,
+    },
+    locked_out: false,
+    alert: null,
+    quiz_visible: false,
+    quiz_answer: null,
+    sign_quiz: null,
+    still_here_button: null,
+    next_button: null,
+    resume_chapter_button: null,
+    start_chapter_button: null,
+};
+
+if (wants("lockout")) {
+    state.locked_out = state.markers.lockout;
+}
+
+if (wants("alert") && document.querySelector(".alert")) {
+    const question = document.querySelector(".questionLabel");
+    const answers = Array.from(
+        document.querySelectorAll(".answerLabel label.required")
+    );
+    state.alert = {
+        question: text(question),
+        answers: answers,
+        answer_texts: answers.map(text),
+    };
+}
+
+if (wants("quiz")) {
+    const quiz = document.getElementById("quiz-answer-group");
+    if (quiz && quiz.getAttribute("style") !== "display: none;") {
+        state.quiz_visible = true;
+        state.quiz_answer = find("quiz_answer");
+    }
+}
+
+if (wants("sign_quiz") && state.markers.sign_quiz) {
+    state.sign_quiz = {
+        question: text(document.querySelector(".question-prompt")),
+        answer_texts: Array.from(
+            document.querySelectorAll(".question-answers label p")
+        ).map(text),
+    };
+}
+
+if (wants("still_here")) {
+    state.still_here_button = find("still_here_button");
+}
+
+if (wants("next")) {
+    state.next_button = find("next_button");
+}
+
+if (wants("chapter")) {
+    state.resume_chapter_button = find("resume_chapter_button");
+    state.start_chapter_button = find("start_chapter_button");
+}
+
+return state;
+"""
+
+# mutations that only rewrite text (a ticking countdown) wake the watch only if
+# the content text without digits changed too; anything else always does
+PAGE_CHANGE_SCRIPT = """
+const [lastToken, timeoutMs, done] = arguments;
+""" + CONTENT_SCRIPT + """
+const textOnly = (mutation) => mutation.type === "characterData"
+    || (mutation.type === "childList"
+        && [...mutation.addedNodes, ...mutation.removedNodes]
+            .every((node) => node.nodeType === Node.TEXT_NODE));
+
+if (!window.__pageWatch) {
+    const watch = {
+        id: Math.random().toString(36).slice(2),
+        version: 0,
+        href: window.location.href,
+        content: contentText(),
+        listeners: [],
+    };
+    const bump = () => {
+        watch.version += 1;
+        watch.listeners.splice(0).forEach((listener) => listener());
+    };
+    const onMutations = (mutations) => {
+        const content = contentText();
+        if (mutations.every(textOnly) && content === watch.content) {
+            return;
+        }
+        watch.content = content;
+        bump();
+    };
+    new MutationObserver(onMutations).observe(document.documentElement, {
+        childList: true,
+        subtree: true,
+        attributes: true,
+        characterData: true,
+    });
+    window.addEventListener("popstate", bump);
+    window.addEventListener("hashchange", bump);
+    window.__pageWatch = watch;
+}
+
+const watch = window.__pageWatch;
+const token = () => ({
+    id: watch.id,
+    version: watch.version,
+    href: window.location.href,
+});
+const changed = () => !lastToken
+    || lastToken.id !== watch.id
+    || lastToken.version !== watch.version
+    || lastToken.href !== window.location.href;
+
+if (changed()) {
+    done({ changed: true, token: token() });
+} else {
+    const timer = setTimeout(() => {
+        watch.listeners = watch.listeners.filter((l) => l !== onChange);
+        done({ changed: false, token: token() });
+    }, timeoutMs);
+    const onChange = () => {
+        clearTimeout(timer);
+        setTimeout(() => done({ changed: true, token: token() }), 50);
+    };
+    watch.listeners.push(onChange);
+}
+"""
+
+# waits, polling every 50ms, for one readiness step and reports whether it was
+# reached within timeoutMs. "network" treats the page as idle once no resource
+# has finished loading for `arg` ms; resource timing only lists finished
+# requests, so it is a quiet period rather than a count of open connections
+PAGE_READY_SCRIPT = """
+const [step, arg, timeoutMs, done] = arguments;
+
+const checks = {
+    load: () => document.readyState === "complete",
+    element: () => document.querySelector(arg) !== null,
+    network: () => {
+        const lastResponse = performance.getEntriesByType("resource")
+            .reduce((end, entry) => Math.max(end, entry.responseEnd), 0);
+        return performance.now() - lastResponse >= arg;
+    },
+};
+
+const deadline = performance.now() + timeoutMs;
+const poll = () => {
+    if (checks[step]()) {
+        done(true);
+    } else if (performance.now() >= deadline) {
+        done(false);
+    } else {
+        setTimeout(poll, 50);
+    }
+};
+poll();
+"""
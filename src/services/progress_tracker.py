@@ -0,0 +1,80 @@
+import time
+from collections import deque
+
+
+class ProgressTracker:
+    """Tracks page transitions from the probe's URL, page index and content hash.
+
+    A page counts as new when its URL or page index changes, so lessons that
+    share a title are still told apart. A change of content alone, such as a
+    quiz appearing, is not a new page but still shows the course is moving,
+    so it only restarts the stall timer.
+    """
+
+    def __init__(self, history=500):
+        self.transitions = deque(maxlen=history)
+        self.reset()
+
+    def reset(self):
+        self.started = time.monotonic()
+        self.page = None
+        self.content_hash = None
+        self.last_progress = self.started
+        self.last_alert = None
+        self.pages = 0
+        self.transitions.clear()
+
+    def record(self, state):
+        """Records the current page and returns whether it is a new one."""
+        page = (state["url"], state["page_index"])
+        if state["content_hash"] != self.content_hash:
+            self.content_hash = state["content_hash"]
+            self.restart_stall_timer()
+        if page == self.page:
+            return False
+
+        if self.page is not None:
+            # the first page is where the run started, not a page advanced
+            self.pages += 1
+            self.transitions.append((time.time(), *page))
+        self.page = page
+        self.restart_stall_timer()
+        return True
+
+    def restart_stall_timer(self):
+        """Starts the no-progress timer again, e.g. after the driver was restarted."""
+        self.last_progress = time.monotonic()
+        self.last_alert = None
+
+    def stalled_for(self):
+        """Returns how many seconds have passed without progress."""
+        return time.monotonic() - self.last_progress
+
+    def should_alert(self, threshold):
+        """Returns True once per threshold period while there is no progress."""
+        now = time.monotonic()
+        if now - self.last_progress <= threshold:
+            return False
+        if self.last_alert is not None and now - self.last_alert <= threshold:
+            return False
+        self.last_alert = now
+        return True
+
+    def pages_per_hour(self, window=None):
+        """Returns the page rate over the whole run, or over the last window seconds."""
+        if window is None:
+            elapsed = time.monotonic() - self.started
+            return self.pages / elapsed * 3600 if elapsed > 0 else 0.0
+
+        since = time.time() - window
+        recent = sum(1 for timestamp, _, _ in self.transitions if timestamp >= since)
+        elapsed = min(window, time.monotonic() - self.started)
+        return recent / elapsed * 3600 if elapsed > 0 else 0.0
+
+    def summary(self):
+        return (
+            f"Pages advanced: {self.pages} "
+            f"({self.pages_per_hour():.1f}/h overall, "
+            f"{self.pages_per_hour(3600):.1f}/h last hour)\n"
+            f"Last progress:  {self.stalled_for() / 60:.1f} min ago"
+        )
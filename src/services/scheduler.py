@@ -0,0 +1,25 @@
+from config.config import Config
+
+
+class AdaptivePoller:
+    """Backs off the delay between ticks while the page stays the same.
+
+    The delay starts at POLL_FLOOR, is multiplied by POLL_BACKOFF after every
+    tick that saw no change, up to POLL_CEILING, and drops back to the floor
+    as soon as a tick interacts with the page or sees it change.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.delay = Config.POLL_FLOOR
+
+    def next_delay(self, changed):
+        """Returns the delay before the next tick."""
+        if changed:
+            self.delay = Config.POLL_FLOOR
+        else:
+            delay = max(self.delay, Config.POLL_FLOOR) * Config.POLL_BACKOFF
+            self.delay = min(Config.POLL_CEILING, delay)
+        return self.delay
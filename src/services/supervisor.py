@@ -0,0 +1,144 @@
+import asyncio
+import time
+from config.config import Config
+
+
+class FailureKind:
+    PAGE = "page error"  # the page changed under a command, retry the tick
+    DRIVER_LOST = "driver lost"  # chromedriver or the renderer is gone, restart Chrome
+    FATAL = "fatal"  # a bug or misconfiguration, restarting won't help
+
+
+DRIVER_LOST_MESSAGES = (
+    "chrome not reachable",
+    "disconnected",
+    "session deleted",
+    "invalid session id",
+    "no such window",
+    "target window already closed",
+    "tab crashed",
+    "timed out receiving message from renderer",
+    "unable to receive message from renderer",
+)
+
+
+def classify_failure(error):
+    """Decides how the supervisor should react to an exception from the loop."""
+    from selenium.common.exceptions import (
+        InvalidSessionIdException,
+        NoSuchWindowException,
+        TimeoutException,
+        WebDriverException,
+    )
+    from urllib3.exceptions import HTTPError
+
+    if isinstance(
+        error, (InvalidSessionIdException, NoSuchWindowException, TimeoutException)
+    ):
+        return FailureKind.DRIVER_LOST
+    if isinstance(error, WebDriverException):
+        message = (error.msg or str(error)).lower()
+        if any(text in message for text in DRIVER_LOST_MESSAGES):
+            return FailureKind.DRIVER_LOST
+        return FailureKind.PAGE
+    if isinstance(error, (HTTPError, ConnectionError)):
+        # chromedriver itself has died and refuses connections
+        return FailureKind.DRIVER_LOST
+    return FailureKind.FATAL
+
+
+class Supervisor:
+    """Recovers the automation loop from driver failures.
+
+    Page errors are retried a few times before being escalated. A lost driver
+    is replaced with a fresh Chrome, with exponential backoff between
+    attempts, and the course is resumed from the last known URL.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.restarts = 0
+        self.failed_restarts = 0
+        self.page_errors = 0
+        self.recovery_times = []
+
+    def backoff(self, attempt):
+        return min(
+            Config.RESTART_BACKOFF_MAX, Config.RESTART_BACKOFF_BASE * 2**attempt
+        )
+
+    def record_success(self):
+        """Called after a healthy tick to reset the page error streak."""
+        self.page_errors = 0
+
+    async def recover(self, error):
+        """Tries to recover from an error. Returns False if the loop must give up."""
+        kind = classify_failure(error)
+        logger = self.service.bot.logger
+        logger.warning("Automation failure (%s): %s", kind, error)
+
+        if kind == FailureKind.FATAL:
+            return False
+
+        if kind == FailureKind.PAGE:
+            self.page_errors += 1
+            if self.page_errors <= Config.MAX_PAGE_ERRORS:
+                await asyncio.sleep(Config.RESTART_BACKOFF_BASE)
+                return True
+            logger.warning(
+                "%d page errors in a row. Restarting the driver.", self.page_errors
+            )
+
+        return await self.restart(f"WebDriver failed ({type(error).__name__})")
+
+    async def restart(self, reason):
+        """Restarts Chrome with bounded exponential backoff.
+
+        Returns False if every attempt failed or the loop was stopped.
+        """
+        logger = self.service.bot.logger
+        failed_at = time.monotonic()
+        self.service.bot.outbox.send(f"```⚠️ {reason}. Restarting...```")
+
+        for attempt in range(Config.MAX_RESTARTS):
+            delay = self.backoff(attempt)
+            logger.info(
+                "Restarting the driver in %.0fs (attempt %d/%d)...",
+                delay,
+                attempt + 1,
+                Config.MAX_RESTARTS,
+            )
+            await asyncio.sleep(delay)
+            if not self.service.running:
+                return False
+
+            try:
+                await self.service.restart_driver()
+            except Exception as e:
+                self.failed_restarts += 1
+                logger.error("Driver restart failed: %s", e)
+                continue
+            if not self.service.running:
+                return False
+
+            recovery_time = time.monotonic() - failed_at
+            self.restarts += 1
+            self.page_errors = 0
+            self.recovery_times.append(recovery_time)
+            logger.success("Driver recovered in %.1fs.", recovery_time)
+            self.service.bot.outbox.send(
+                f"```✅ WebDriver recovered in {recovery_time:.0f}s.```"
+            )
+            return True
+
+        return False
+
+    def summary(self):
+        if not self.recovery_times:
+            return f"Driver restarts:   0 ({self.failed_restarts} failed attempts)"
+        mean = sum(self.recovery_times) / len(self.recovery_times)
+        return (
+            f"Driver restarts:   {self.restarts} "
+            f"({self.failed_restarts} failed attempts), "
+            f"recovery mean {mean:.1f}s, max {max(self.recovery_times):.1f}s"
+        )
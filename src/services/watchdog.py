@@ -0,0 +1,140 @@
+import asyncio
+import time
+from config.config import Config
+from utils.process_stats import driver_processes, load_psutil, sample_processes
+
+# CPU spikes while a page loads, so only a sustained excess counts
+CPU_SAMPLES_OVER_LIMIT = 3
+
+
+class ResourceWatchdog:
+    """Samples the memory and CPU use of chromedriver and its Chrome processes.
+
+    When the RSS or sustained CPU use goes over its limit, Chrome is recycled
+    at the next safe point: right after the course moves on to a new page, or
+    once RECYCLE_GRACE seconds have passed without one. The renderer is
+    recycled first by moving to a fresh tab; if that does not bring Chrome
+    back under its limits, the whole driver is restarted. Nothing is watched
+    when psutil is not installed.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self.available = load_psutil() is not None
+        self.renderer_recycles = 0
+        self.driver_recycles = 0
+        self.reset()
+
+    def reset(self):
+        """Forgets the processes of the previous driver."""
+        self.processes = {}
+        self.last_sample = None
+        self.sampled_at = None
+        self.cpu_over_limit = 0
+        self.over_limit_since = None
+        self.recycled_renderer = False
+        self.pages = self.service.progress.pages
+
+    def sample(self):
+        """Samples the driver's process tree. Blocks while psutil reads it."""
+        processes = driver_processes(self.service.driver)
+        # cpu_percent() measures since the previous call on the same object
+        self.processes = {
+            process.pid: self.processes.get(process.pid, process)
+            for process in processes
+        }
+        return sample_processes(list(self.processes.values()))
+
+    def over_limit(self, sample):
+        """Returns the reason the sample is over its limits, or None."""
+        rss_mb = sample["rss"] / 2**20
+        if Config.CHROME_MAX_RSS_MB and rss_mb > Config.CHROME_MAX_RSS_MB:
+            return f"RSS {rss_mb:.0f} MB > {Config.CHROME_MAX_RSS_MB} MB"
+
+        if Config.CHROME_MAX_CPU and sample["cpu"] > Config.CHROME_MAX_CPU:
+            self.cpu_over_limit += 1
+        else:
+            self.cpu_over_limit = 0
+        if self.cpu_over_limit >= CPU_SAMPLES_OVER_LIMIT:
+            return f"CPU {sample['cpu']:.0f}% > {Config.CHROME_MAX_CPU:g}%"
+        return None
+
+    async def check(self):
+        """Samples Chrome when due and recycles it if it is over its limits.
+
+        Called by the automation loop between ticks.
+        """
+        if not self.available or not Config.WATCHDOG_INTERVAL:
+            return
+        if self.service.driver is None:
+            return
+
+        now = time.monotonic()
+        new_page = self.service.progress.pages != self.pages
+        self.pages = self.service.progress.pages
+        if self.sampled_at is None or now - self.sampled_at >= Config.WATCHDOG_INTERVAL:
+            await self.take_sample(now)
+
+        if self.over_limit_since is None:
+            return
+        if new_page or now - self.over_limit_since >= Config.RECYCLE_GRACE:
+            await self.recycle()
+
+    async def take_sample(self, now):
+        self.sampled_at = now
+        self.last_sample = await asyncio.to_thread(self.sample)
+        self.service.bot.logger.debug("Chrome resources: %s", self.last_sample)
+
+        reason = self.over_limit(self.last_sample)
+        if reason is None:
+            self.over_limit_since = None
+            self.recycled_renderer = False
+        elif self.over_limit_since is None:
+            self.over_limit_since = now
+            self.service.bot.logger.warning(
+                "Chrome is over its resource limits (%s). Recycling it soon.", reason
+            )
+
+    async def recycle(self):
+        """Recycles the renderer, or the whole driver if that was already tried."""
+        logger = self.service.bot.logger
+        self.over_limit_since = None
+        self.cpu_over_limit = 0
+
+        if not self.recycled_renderer:
+            logger.info("Recycling the Chrome renderer...")
+            try:
+                await self.service.recycle_renderer()
+                self.recycled_renderer = True
+                self.renderer_recycles += 1
+                self.service.bot.outbox.send("```♻️ Recycled the Chrome renderer.```")
+                return
+            except Exception as e:
+                logger.warning("Failed to recycle the renderer: %s", e)
+
+        logger.info("Recycling the driver...")
+        # the supervisor retries a Chrome that fails to start, e.g. while the
+        # old one still holds the profile directory
+        if not await self.service.supervisor.restart("Chrome is over its limits"):
+            if not self.service.running:
+                return
+            raise RuntimeError("Chrome could not be restarted after recycling it.")
+        self.driver_recycles += 1
+        self.service.bot.outbox.send("```♻️ Restarted Chrome to free resources.```")
+
+    def summary(self):
+        recycles = (
+            f"Recycles:       {self.renderer_recycles} renderer, "
+            f"{self.driver_recycles} driver"
+        )
+        if not self.available:
+            return f"Chrome:         not sampled (psutil is not installed)\n{recycles}"
+        if self.last_sample is None:
+            return f"Chrome:         not sampled yet\n{recycles}"
+        return (
+            f"Chrome:         {self.last_sample['rss'] / 2**20:.0f} MB RSS, "
+            f"{self.last_sample['cpu']:.0f}% CPU, "
+            f"{self.last_sample['processes']} processes "
+            f"({time.monotonic() - self.sampled_at:.0f}s ago)\n"
+            f"{recycles}"
+        )
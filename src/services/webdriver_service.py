@@ -1,390 +1,792 @@
 import sys
+import time
 import asyncio
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.options import Options
-from datetime import datetime, timedelta
 from config.config import Config
-
-
+from services.browser_profile import apply_request_blocking, build_chrome_options
+from services.driver_backend import create_backend
+from services.driver_executor import DriverExecutor
+from services.flight_recorder import FlightRecorder
+from services.locators import ElementCache
+from services.metrics import Metrics, count_webdriver_commands
+from services.page_classifier import PAGE_DETECTORS, PageClassifier, probe_sections
+from services.page_probe import PAGE_CHANGE_SCRIPT, PAGE_PROBE_SCRIPT, PAGE_READY_SCRIPT
+from services.progress_tracker import ProgressTracker
+from services.scheduler import AdaptivePoller
+from services.supervisor import FailureKind, Supervisor, classify_failure
+from services.watchdog import ResourceWatchdog
+from utils.compression import encode_screenshot, gzip_text
+from utils.startup_profile import startup
+from utils.tracer import trace_methods, trace_webdriver, tracer
+
+# longest single in-browser wait for a page change (s); other driver calls, such
+# as !screenshot, queue behind it, but a backed-off loop makes fewer of them
+PAGE_WAIT_SLICE = 5
+
+
+@trace_methods("service")
 class WebDriverService:
     def __init__(self, bot):
         self.bot = bot
+        self.backend = None
         self.driver = None
+        self.executor = DriverExecutor()
+        self.classifier = PageClassifier()
+        self.elements = ElementCache()
+        self.poller = AdaptivePoller()
+        self.progress = ProgressTracker()
+        self.metrics = Metrics(self.progress)
+        self.supervisor = Supervisor(self)
+        self.watchdog = ResourceWatchdog(self)
+        self.recorder = FlightRecorder(self)
+        self.last_course_url = None
         self.running = False
-        self.time_title_last_checked = None
-        self.title_state = None
+        self.startup = None
+        self.page_token = None
 
     #################################
     # BASE FUNCTIONS FOR THE DRIVER #
     #################################
+    async def call(self, func, *args, **kwargs):
+        """Runs a blocking driver call on the driver thread."""
+        return await self.executor.call(func, *args, **kwargs)
+
     async def click_element(self, by, value):
         """Attempts to click an element on the page."""
-        self.bot.logger.debug(f"Attempting to click element: {value}...")
+        self.bot.logger.debug("Attempting to click element: %s...", value)
         try:
-            element = self.driver.find_element(by, value)
-            element.click()
-            self.bot.logger.debug(f"Successfully clicked element: {value}")
+            element = await self.call(self.driver.find_element, by, value)
+            await self.call(element.click)
+            self.bot.logger.debug("Successfully clicked element: %s", value)
+            await self.wait_until_ready()
+            return True
         except Exception as e:
             self.bot.logger.debug(
-                f"Failed to click element with {by}: {value}. Error: {e}"
+                "Failed to click element with %s: %s. Error: %s", by, value, e
             )
+            return False
+
+    async def hover_and_click(self, element):
+        """Moves the mouse over an element and clicks it."""
+        from selenium.webdriver.common.action_chains import ActionChains
+
+        def _hover_and_click():
+            ActionChains(self.driver).move_to_element(element).perform()
+            element.click()
+
+        await self.call(_hover_and_click)
 
     async def get_title(self):
         """Retrieves the current page title."""
         self.bot.logger.debug("Retrieving page title...")
         try:
-            title = self.driver.title
-            self.bot.logger.debug(f"Page title retrieved: {title}")
+            title = await self.call(self.backend.title)
+            self.bot.logger.debug("Page title retrieved: %s", title)
             return title
         except Exception as e:
-            self.bot.logger.error(f"Failed to retrieve page title: {e}")
+            self.bot.logger.error("Failed to retrieve page title: %s", e)
             return None
 
-    async def save_screenshot(self, path):
-        """Takes a screenshot of the current page."""
-        self.bot.logger.debug(f"Taking a screenshot and saving to {path}...")
+    async def get_screenshot(self, image_format="png", quality=None):
+        """Takes a screenshot of the current page.
+
+        Returns the image bytes and their format, which is PNG unless the
+        backend can encode the requested format itself.
+        """
+        self.bot.logger.debug("Taking a screenshot...")
         try:
-            self.driver.save_screenshot(path)
+            screenshot = await self.call(
+                self.backend.screenshot, image_format, quality
+            )
             self.bot.logger.debug("Screenshot taken successfully.")
+            return screenshot
         except Exception as e:
-            self.bot.logger.error(f"Failed to take screenshot: {e}")
+            self.bot.logger.error("Failed to take screenshot: %s", e)
+            return None, None
+
+    async def take_screenshot(self, image_format, scale, quality):
+        """Takes a screenshot encoded in the given format and scale.
+
+        Returns the image bytes and their file extension, or (None, None).
+        """
+        image, source_format = await self.get_screenshot(image_format, quality)
+        if image is None:
+            return None, None
+        return await asyncio.to_thread(
+            encode_screenshot,
+            image,
+            image_format,
+            min(max(scale, 0.1), 1.0),
+            quality,
+            source_format,
+        )
 
     async def get_dom(self):
         """Retrieves the current DOM."""
         self.bot.logger.debug("Retrieving DOM...")
         try:
-            dom = self.driver.page_source
+            dom = await self.call(self.backend.page_source)
             self.bot.logger.debug("DOM retrieved.")
             return dom
         except Exception as e:
-            self.bot.logger.error(f"Failed to retrieve DOM: {e}")
+            self.bot.logger.error("Failed to retrieve DOM: %s", e)
             return None
 
+    async def status(self):
+        """Summarizes progress and Chrome's resource use for !status."""
+        return f"{self.progress.summary()}\n{self.watchdog.summary()}"
+
+    async def stats(self):
+        """Summarizes loop metrics and driver recoveries for !stats."""
+        return f"{self.metrics.summary()}\n\n{self.supervisor.summary()}"
+
+    async def replay(self, count):
+        """Archives the last `count` flight recordings for !replay.
+
+        Returns the number archived, the number held and the zip bytes.
+        """
+        recordings = len(self.recorder.recordings)
+        if not recordings:
+            return 0, 0, None
+        count = max(1, min(count, recordings))
+        return count, recordings, await asyncio.to_thread(
+            self.recorder.archive, count
+        )
+
+    async def trace(self):
+        """Exports the recorded spans for !trace.
+
+        Returns the number of spans and the gzipped Chrome Trace Event JSON.
+        """
+        data = await asyncio.to_thread(lambda: gzip_text(tracer.export()))
+        return len(tracer.events), data
+
     #################################
     # BASE FUNCTIONS FOR AUTOMATION #
     #################################
+    async def wait_for_step(self, step, arg, timeout):
+        """Waits until one readiness step of PAGE_READY_SCRIPT is reached.
+
+        Like wait_for_page_change, the wait is split into short in-browser
+        waits. Returns False if the step is not reached within the timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                if await self.call(
+                    self.backend.execute_async_script,
+                    PAGE_READY_SCRIPT,
+                    step,
+                    arg,
+                    int(min(remaining, 1) * 1000),
+                ):
+                    return True
+            except Exception as e:
+                # the document being waited on was replaced by a navigation; a
+                # lost driver goes straight to the supervisor instead
+                if classify_failure(e) != FailureKind.PAGE:
+                    raise
+                self.bot.logger.debug("Readiness check interrupted: %s", e)
+                await asyncio.sleep(0.05)
+
+    async def wait_until_ready(self, selector=None):
+        """Waits until the page is ready for the next command.
+
+        The page must have finished loading, `selector` must match an element
+        and, when NETWORK_IDLE is set, the network must have gone quiet. Each
+        step has its own timeout. Returns False, after logging the step that
+        timed out, if the page was not ready.
+        """
+        steps = [("load", None, Config.NAV_LOAD_TIMEOUT)]
+        if selector:
+            steps.append(("element", selector, Config.NAV_ELEMENT_TIMEOUT))
+        if Config.NETWORK_IDLE:
+            idle_ms = Config.NETWORK_IDLE * 1000
+            steps.append(("network", idle_ms, Config.NAV_IDLE_TIMEOUT))
+
+        for step, arg, timeout in steps:
+            if not await self.wait_for_step(step, arg, timeout):
+                self.bot.logger.warning(
+                    "Page not ready after %.0fs, still waiting for %s.",
+                    timeout,
+                    selector if step == "element" else step,
+                )
+                return False
+        return True
+
+    async def navigate(self, url, selector=None):
+        """Opens a URL and waits until the page is ready, see wait_until_ready."""
+        await self.call(self.backend.get, url)
+        return await self.wait_until_ready(selector)
+
     async def login(self, username, password):
         """Logs into the website."""
+        from selenium.webdriver.common.by import By
+
         self.bot.logger.debug("Logging in...")
-        self.driver.get("https://school.toocooltrafficschool.com/login")
-        await asyncio.sleep(1)
-        self.driver.find_element(By.ID, "username").send_keys(username)
-        self.driver.find_element(By.ID, "password").send_keys(password)
-        self.driver.find_element(By.ID, "_submit").click()
+        await self.navigate(Config.login_url, "#username")
+
+        def _submit_credentials():
+            self.driver.find_element(By.ID, "username").send_keys(username)
+            self.driver.find_element(By.ID, "password").send_keys(password)
+            self.driver.find_element(By.ID, "_submit").click()
+
+        await self.call(_submit_credentials)
+        await self.wait_until_ready()
         self.bot.logger.success("Login attempt completed.")
 
     async def start_course(self):
         """Starts the course by navigating to the course URL."""
         self.bot.logger.debug("Starting the course...")
-        self.driver.get(Config.course_url)
-        await asyncio.sleep(1)
-        await self.check_chapter_button()
+        await self.navigate(Config.course_url)
+        await self.check_chapter_button(await self.probe_page())
         self.bot.logger.success("Course started.")
 
-    async def check_locked_out(self):
-        """Checks if the user is locked out due to exceeding daily limits."""
-        self.bot.logger.debug("Checking for lockout status...")
+    async def is_logged_in(self):
+        """Checks whether the current page belongs to an authenticated session."""
+        return await self.call(
+            self.backend.execute_script,
+            "return !window.location.href.startsWith(arguments[0])"
+            " && !document.getElementById('username');",
+            Config.login_url,
+        )
+
+    async def start_session(self):
+        """Opens the course, logging in only when there is no valid saved session."""
+        if Config.CHROME_PROFILE_DIR:
+            self.bot.logger.debug("Checking for a saved session...")
+            await self.navigate(Config.course_url)
+            if await self.is_logged_in():
+                self.bot.logger.success("Restored saved session.")
+                await self.check_chapter_button(await self.probe_page())
+                self.bot.logger.success("Course started.")
+                return
+            self.bot.logger.info("Saved session has expired. Logging in again.")
+
+        await self.login(Config.username, Config.password)
+        await self.start_course()
+
+    async def probe_page(self, sections=None):
+        """Captures a snapshot of the page state the detectors need in one call.
+
+        Only the given probe sections are read; all of them when None. Element
+        handles found by earlier probes of the same page are passed back in so
+        the probe can skip searching for them.
+        """
+        from selenium.common.exceptions import StaleElementReferenceException
+
+        self.bot.logger.debug("Probing page state...")
         try:
-            self.driver.find_element(By.ID, "myLockoutModal")
-            self.bot.logger.info("Locked out detected. Stopping the bot.")
-            await self.bot.log_channel.send("@everyone")
-            await self.bot.log_channel.send(
-                "```✅ You have been locked out as you reached the maximum of 4 hours in a day.```"
+            state = await self.call(
+                self.backend.execute_script,
+                PAGE_PROBE_SCRIPT,
+                sections,
+                self.elements.elements,
             )
-            await self.bot.log_channel.send(
-                "```⚙️ The bot will stop now. Restart the bot tomorrow to continue.```"
+        except StaleElementReferenceException:
+            # a cached handle belongs to a document that has been replaced
+            self.bot.logger.debug("Cached elements are stale. Probing again.")
+            self.elements.clear()
+            state = await self.call(
+                self.backend.execute_script, PAGE_PROBE_SCRIPT, sections, {}
             )
-            await self.stop()
-            await self.bot.close()
-            sys.exit(0)
-        except Exception:
+        self.elements.update(state)
+        return state
+
+    async def wait_for_page_change(self, timeout):
+        """Waits until the content or URL changes, or until the timeout expires.
+
+        Countdown timers ticking on the page don't end the wait, see
+        PAGE_CHANGE_SCRIPT. The wait is split into in-browser waits of at most
+        PAGE_WAIT_SLICE seconds so other driver calls are never held up long.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                result = await self.call(
+                    self.backend.execute_async_script,
+                    PAGE_CHANGE_SCRIPT,
+                    self.page_token,
+                    int(min(remaining, PAGE_WAIT_SLICE) * 1000),
+                )
+            except Exception as e:
+                # navigating away unloads the document the script was waiting in
+                self.bot.logger.debug("Page change wait interrupted: %s", e)
+                self.page_token = None
+                self.elements.clear()
+                return True
+            if self.page_token and result["token"]["id"] != self.page_token["id"]:
+                # a new document, every cached handle is gone with the old one
+                self.elements.clear()
+            self.page_token = result["token"]
+            if result["changed"]:
+                self.bot.logger.debug("Page change detected.")
+                return True
+        return False
+
+    async def click(self, element, name):
+        """Attempts to click an element returned by the page probe."""
+        self.bot.logger.debug("Attempting to click %s...", name)
+        try:
+            await self.call(element.click)
+            self.bot.logger.debug("Successfully clicked %s.", name)
+            await self.wait_until_ready()
+            return True
+        except Exception as e:
+            self.bot.logger.debug("Failed to click %s. Error: %s", name, e)
+            self.elements.clear()
+            return False
+
+    async def check_locked_out(self, state):
+        """Checks if the user is locked out due to exceeding daily limits."""
+        self.bot.logger.debug("Checking for lockout status...")
+        if not state["locked_out"]:
             self.bot.logger.debug("No lockout detected.")
-            pass
+            return False
+
+        self.bot.logger.info("Locked out detected. Stopping the bot.")
+        self.bot.outbox.send("@everyone")
+        self.bot.outbox.send(
+            "```✅ You have been locked out as you reached the maximum of 4 hours in a day.```"
+        )
+        self.bot.outbox.send(
+            "```⚙️ The bot will stop now. Restart the bot tomorrow to continue.```"
+        )
+        await self.stop()
+        await self.bot.outbox.flush()
+        await self.bot.close()
+        sys.exit(0)
 
-    async def check_chapter_button(self):
+    async def check_chapter_button(self, state):
         """Checks for and clicks the 'Resume Chapter' or 'Start Chapter' button."""
-        try:
-            if self.driver.current_url == Config.course_url:
-                resume_button = self.driver.find_element(
-                    By.XPATH, '//span[contains(text(), "Resume Chapter")]'
-                )
-                actions = ActionChains(self.driver)
-                actions.move_to_element(resume_button).perform()
-                resume_button.click()
-                self.bot.logger.debug("Resumed chapter successfully.")
-        except Exception as e:
-            self.bot.logger.debug(f"Failed to resume chapter: {e}")
+        if state["url"] != Config.course_url:
+            return False
 
-        try:
-            if self.driver.current_url == Config.course_url:
-                start_button = self.driver.find_element(
-                    By.XPATH, '//span[contains(text(), "Start Chapter")]'
-                )
-                actions = ActionChains(self.driver)
-                actions.move_to_element(start_button).perform()
-                start_button.click()
+        if state["resume_chapter_button"]:
+            try:
+                await self.hover_and_click(state["resume_chapter_button"])
+                self.bot.logger.debug("Resumed chapter successfully.")
+                await self.wait_until_ready()
+                return True
+            except Exception as e:
+                self.bot.logger.debug("Failed to resume chapter: %s", e)
+
+        if state["start_chapter_button"]:
+            try:
+                await self.hover_and_click(state["start_chapter_button"])
                 self.bot.logger.debug("Started chapter successfully.")
-        except Exception as e:
-            self.bot.logger.debug(f"Failed to start chapter: {e}")
-
-    async def check_title(self):
-        """Checks if the page title has changed within the last 3 minutes."""
-        self.bot.logger.debug("Checking page title...")
-        if self.time_title_last_checked is None:
-            self.time_title_last_checked = datetime.now()
-            self.title_state = await self.get_title()
-
-        time_now = datetime.now()
-        time_diff = time_now - self.time_title_last_checked
-        if time_diff > timedelta(minutes=3):
-            new_title_state = await self.get_title()
-            if new_title_state is None:
-                self.bot.logger.error("Failed to retrieve page title. Skipping check.")
-                return
-
-            if new_title_state != self.title_state:
-                self.title_state = new_title_state
-                self.time_title_last_checked = time_now
-            else:
-                self.bot.logger.warning("Page title has not changed in 3 minutes.")
-                await self.bot.log_channel.send("@everyone")
-                await self.bot.log_channel.send(
-                    "```🚨 Page title has not changed in 3 minutes.```"
-                )
-                await self.bot.log_channel.send(
-                    "```⚙️ Use !screenshot to see the current state.```"
-                )
-                self.time_title_last_checked = time_now
+                await self.wait_until_ready()
+                return True
+            except Exception as e:
+                self.bot.logger.debug("Failed to start chapter: %s", e)
+
+        return False
+
+    async def check_progress(self, state):
+        """Alerts when the page content has not moved on within the stall threshold."""
+        self.bot.logger.debug("Checking progress...")
+        if self.progress.should_alert(Config.STALL_THRESHOLD):
+            minutes = self.progress.stalled_for() / 60
+            self.bot.logger.warning("No progress in %.0f minutes.", minutes)
+            self.bot.outbox.send("@everyone")
+            self.bot.outbox.send(f"```🚨 No progress in {minutes:.0f} minutes.```")
+            self.bot.outbox.send(
+                "```⚙️ Use !replay to see the last pages or !screenshot to see the current state.```"
+            )
+            await self.recorder.capture("stall", state)
+        return False
 
-    async def check_still_here_button(self):
+    async def check_still_here_button(self, state):
         """Clicks the 'I'm Still Here' button if present."""
-        return await self.click_element(
-            By.XPATH, '//button[contains(text(), "I\'m Still Here")]'
-        )
+        if not state["still_here_button"]:
+            return False
+        return await self.click(state["still_here_button"], "'I'm Still Here' button")
 
-    async def check_alert(self):
+    async def check_alert(self, state):
         """Checks for and handles any alerts on the page."""
+        from selenium.webdriver.common.by import By
+
         self.bot.logger.debug("Checking for alerts...")
-        try:
-            alert = self.driver.find_element(By.CLASS_NAME, "alert")
-            self.bot.logger.debug("Alert found.")
-            question_element = self.driver.find_element(By.CLASS_NAME, "questionLabel")
-            answers_elements = self.driver.find_elements(
-                By.CSS_SELECTOR, ".answerLabel label.required"
-            )
+        alert = state["alert"]
+        if alert is None:
+            self.bot.logger.debug("No alert found.")
+            return False
+
+        self.bot.logger.debug("Alert found.")
+        if not alert["question"] or not alert["answers"]:
+            self.bot.logger.debug("Alert found but no question detected.")
+            return False
+
+        answers = alert["answer_texts"]
+
+        self.bot.outbox.send("@everyone")
+        self.bot.outbox.send("```🚨 Alert found.```")
+        self.bot.outbox.send(
+            f"```⏳ You have {Config.ALERT_RESPONSE_TIMEOUT / 60:g} minutes to answer before the bot is stopped.```"
+        )
+        self.bot.outbox.send(f"```❓ Question: {alert['question']}```")
+        for i, answer in enumerate(answers, start=1):
+            self.bot.outbox.send(f"```{i}. {answer}```")
+        self.bot.outbox.send(
+            "```⚙️ Please choose an answer by replying with the corresponding number.```"
+        )
 
-            if question_element and answers_elements:
-                question = question_element.text
-                answers = [answer.text for answer in answers_elements]
+        def check_message(m):
+            return m.author != self.bot.user and m.channel == self.bot.log_channel
 
-                await self.bot.log_channel.send("@everyone")
-                await self.bot.log_channel.send("```🚨 Alert found.```")
-                await self.bot.log_channel.send(
-                    "```⏳ You have 5 minutes to answer before the bot is stopped.```"
-                )
-                await self.bot.log_channel.send(f"```❓ Question: {question}```")
-                for i, answer in enumerate(answers, start=1):
-                    await self.bot.log_channel.send(f"```{i}. {answer}```")
-                await self.bot.log_channel.send(
-                    "```⚙️ Please choose an answer by replying with the corresponding number.```"
+        try:
+            with tracer.span("wait_for", "discord"):
+                msg = await self.bot.wait_for(
+                    "message",
+                    check=check_message,
+                    timeout=Config.ALERT_RESPONSE_TIMEOUT,
                 )
-
-                def check_message(m):
-                    return (
-                        m.author != self.bot.user and m.channel == self.bot.log_channel
-                    )
-
-                try:
-                    msg = await self.bot.wait_for(
-                        "message", check=check_message, timeout=300
-                    )  # 5 minutes timeout
-                    choice = int(msg.content.strip())
-                    if 1 <= choice <= len(answers):
-                        answer = answers_elements[choice - 1]
-                        answer.click()
-                        await self.bot.log_channel.send(
-                            f"```✅ Selected answer {choice}.```"
-                        )
-                        submit_button = self.driver.find_element(By.ID, "form_submit")
-                        submit_button.click()
-                        await self.bot.log_channel.send(
-                            "```✅ Form submitted successfully.```"
-                        )
-                    else:
-                        await self.bot.log_channel.send(
-                            "```❌ Invalid choice. Please try again.```"
-                        )
-                except asyncio.TimeoutError:
-                    await self.bot.log_channel.send(
-                        "```❌ No response received. Stopping the bot.```"
-                    )
-                    await self.stop()
-                except ValueError:
-                    await self.bot.log_channel.send(
-                        "```❌ Invalid input. Please enter a number.```"
-                    )
+            choice = int(msg.content.strip())
+            if 1 <= choice <= len(answers):
+                await self.click(alert["answers"][choice - 1], f"answer {choice}")
+                self.bot.outbox.send(f"```✅ Selected answer {choice}.```")
+                await self.click_element(By.ID, "form_submit")
+                self.bot.outbox.send("```✅ Form submitted successfully.```")
             else:
-                self.bot.logger.debug("Alert found but no question detected.")
-        except Exception as e:
-            self.bot.logger.debug(f"No alert found: {e}")
+                self.bot.outbox.send("```❌ Invalid choice. Please try again.```")
+        except asyncio.TimeoutError:
+            self.bot.outbox.send("```❌ No response received. Stopping the bot.```")
+            await self.stop()
+        except ValueError:
+            self.bot.outbox.send("```❌ Invalid input. Please enter a number.```")
+        return True
 
-    async def check_quiz(self):
+    async def check_quiz(self, state):
         """Checks for and handles any quizzes on the page."""
+        from selenium.webdriver.common.by import By
+
         self.bot.logger.debug("Checking for quizzes...")
-        try:
-            quiz = self.driver.find_element(By.ID, "quiz-answer-group")
-            if not quiz.get_attribute("style") == "display: none;":
-                clicked = await self.click_element(
-                    By.XPATH, "//label[@data-correct='yes']"
-                )
-                if clicked:
-                    self.bot.logger.info("Answered quiz successfully.")
-                    await self.bot.log_channel.send(
-                        "```✅ Answered quiz successfully.```"
-                    )
-                else:
-                    self.bot.logger.warning("Failed to answer quiz.")
-                    await self.bot.log_channel.send("@everyone")
-                    await self.bot.log_channel.send(
-                        "```❌ Failed to answer quiz. Use !screenshot to see the current state.```"
-                    )
-        except Exception as e:
-            self.bot.logger.debug(f"No quiz found: {e}")
+        acted = False
 
-        try:
-            quiz = self.driver.find_element(By.CLASS_NAME, "question-sign")
-            if quiz:
-                await self.bot.log_channel.send("@everyone")
-                await self.bot.log_channel.send("```🚨 Question sign quiz found.```")
-                question = self.driver.find_element(
-                    By.CLASS_NAME, "question-prompt"
-                ).text
-                answers = self.driver.find_elements(
-                    By.CSS_SELECTOR, ".question-answers label p"
+        if state["quiz_visible"]:
+            # a failed answer lets the other detectors run and the poller back off
+            clicked = state["quiz_answer"] is not None and await self.click(
+                state["quiz_answer"], "correct quiz answer"
+            )
+            acted = clicked
+            if clicked:
+                self.bot.logger.info("Answered quiz successfully.")
+                self.bot.outbox.send("```✅ Answered quiz successfully.```")
+            else:
+                self.bot.logger.warning("Failed to answer quiz.")
+                await self.recorder.capture("quiz answer failed", state)
+                self.bot.outbox.send("@everyone")
+                self.bot.outbox.send(
+                    "```❌ Failed to answer quiz. Use !screenshot to see the current state.```"
                 )
+        else:
+            self.bot.logger.debug("No quiz found.")
 
-                await self.bot.log_channel.send(f"```❓ Question: {question}```")
-                for i, answer in enumerate(answers, start=1):
-                    await self.bot.log_channel.send(f"```{i}. {answer.text}```")
+        sign_quiz = state["sign_quiz"]
+        if sign_quiz is None:
+            self.bot.logger.debug("No question sign quiz found.")
+            return acted
 
-                await self.bot.log_channel.send(
-                    "```⚙️ Please respond with the number of the correct answer.```"
-                )
+        answers = sign_quiz["answer_texts"]
 
-                def check_message(m):
-                    return (
-                        m.author != self.bot.user and m.channel == self.bot.log_channel
-                    )
+        self.bot.outbox.send("@everyone")
+        self.bot.outbox.send("```🚨 Question sign quiz found.```")
+        self.bot.outbox.send(f"```❓ Question: {sign_quiz['question']}```")
+        for i, answer in enumerate(answers, start=1):
+            self.bot.outbox.send(f"```{i}. {answer}```")
 
-                try:
-                    msg = await self.bot.wait_for(
-                        "message", check=check_message, timeout=60
-                    )
-                    choice = int(msg.content.strip())
-                    if 1 <= choice <= len(answers):
-                        await self.click_element(
-                            By.CSS_SELECTOR,
-                            f".question-answers label:nth-child({choice}) input",
-                        )
-                        await self.bot.log_channel.send(
-                            f"```✅ Selected answer {choice}.```"
-                        )
-                    else:
-                        await self.bot.log_channel.send(
-                            "```❌ Invalid choice. Please try again.```"
-                        )
-                except asyncio.TimeoutError:
-                    await self.bot.log_channel.send(
-                        "```❌ No response received. Please try again.```"
-                    )
-                except ValueError:
-                    await self.bot.log_channel.send(
-                        "```❌ Invalid input. Please enter a number.```"
-                    )
-        except Exception as e:
-            self.bot.logger.debug(f"No question sign quiz found: {e}")
+        self.bot.outbox.send(
+            "```⚙️ Please respond with the number of the correct answer.```"
+        )
+
+        def check_message(m):
+            return m.author != self.bot.user and m.channel == self.bot.log_channel
 
-    async def check_next_button(self):
+        try:
+            with tracer.span("wait_for", "discord"):
+                msg = await self.bot.wait_for(
+                    "message",
+                    check=check_message,
+                    timeout=Config.SIGN_QUIZ_RESPONSE_TIMEOUT,
+                )
+            choice = int(msg.content.strip())
+            if 1 <= choice <= len(answers):
+                await self.click_element(
+                    By.CSS_SELECTOR,
+                    f".question-answers label:nth-child({choice}) input",
+                )
+                self.bot.outbox.send(f"```✅ Selected answer {choice}.```")
+            else:
+                self.bot.outbox.send("```❌ Invalid choice. Please try again.```")
+        except asyncio.TimeoutError:
+            self.bot.outbox.send("```❌ No response received. Please try again.```")
+        except ValueError:
+            self.bot.outbox.send("```❌ Invalid input. Please enter a number.```")
+        return True
+
+    async def check_next_button(self, state):
         """Clicks the 'Next' button if present."""
-        return await self.click_element(By.ID, "next-button")
+        if not state["next_button"]:
+            return False
+        return await self.click(state["next_button"], "'Next' button")
 
     ##############################
     # BASE FUNCTIONS FOR THE BOT #
     ##############################
     async def automate(self):
-        """Runs the automation tasks."""
+        """Runs the detectors that apply to the current page type.
+
+        The page is probed once per tick, reading only the sections those
+        detectors need. It is probed a second time only when the page has just
+        been (re)classified and needs sections the first probe skipped. When
+        a detector interacts with the page, the rest of the tick is skipped and
+        the page is classified again on the next tick.
+
+        Returns whether the tick interacted with the page or saw it change.
+        """
         self.bot.logger.debug("Running automation tasks...")
-        await self.check_alert()
-        await self.check_locked_out()
-        await self.check_quiz()
-        await self.check_still_here_button()
-        await self.check_next_button()
-        await self.check_chapter_button()
-        await self.check_title()
+        tick_started = time.perf_counter()
+        commands_before = self.metrics.webdriver_commands
+
+        sections = None
+        if self.classifier.page_type is not None:
+            sections = probe_sections(self.classifier.page_type)
+        state = await self.probe_page(sections)
+
+        progressed = self.progress.record(state)
+        if not state["url"].startswith(Config.login_url):
+            self.last_course_url = state["url"]
+        if progressed:
+            await self.recorder.capture("page transition", state)
+        page_type, classified = self.classifier.classify(state)
+        if classified:
+            self.bot.logger.debug("Page classified as %s.", page_type)
+            needed = probe_sections(page_type)
+            if sections is not None and not set(needed) <= set(sections):
+                state = await self.probe_page(needed)
+
+        acted = False
+        for name in PAGE_DETECTORS[page_type]:
+            if not self.running:
+                break
+            started = time.perf_counter()
+            try:
+                acted = await getattr(self, name)(state)
+            except Exception as e:
+                # a lost browser has no page to record, and each attempt would
+                # only wait for the connection to time out
+                if classify_failure(e) != FailureKind.DRIVER_LOST:
+                    reason = f"{name} failed: {type(e).__name__}"
+                    await self.recorder.capture(reason, state)
+                raise
+            self.metrics.record_detector(name, time.perf_counter() - started)
+            if acted:
+                self.classifier.reset()
+                self.elements.clear()
+                break
+
+        self.metrics.record_tick(
+            time.perf_counter() - tick_started,
+            self.metrics.webdriver_commands - commands_before,
+        )
 
-        await asyncio.sleep(1)
+        return acted or progressed
+
+    async def wait_for_next_tick(self, changed=True):
+        """Waits between automation ticks, backing off while nothing changes."""
+        delay = self.poller.next_delay(changed)
+        self.bot.logger.debug("Next tick in up to %.1fs.", delay)
+        if Config.EVENT_DRIVEN:
+            await self.wait_for_page_change(delay)
+        else:
+            await asyncio.sleep(delay)
 
     async def create_driver(self):
         """Initializes the WebDriver."""
-        options = Options()
-        options.add_argument("--mute-audio")
-        self.driver = webdriver.Chrome(options=options)
-        self.bot.logger.success("WebDriver initialized.")
+        options = build_chrome_options()
+        backend = create_backend(Config.DRIVER_BACKEND)
+        # only a started backend is kept, so a failed start leaves none behind
+        self.driver = await self.call(backend.start, options)
+        self.backend = backend
+        count_webdriver_commands(self.driver, self.metrics)
+        trace_webdriver(self.driver)
+        await self.call(apply_request_blocking, self.driver)
+        self.bot.logger.success("WebDriver initialized (%s backend).", self.backend.name)
+
+    async def quit_driver(self):
+        """Quits the current driver, giving up on it if it does not respond."""
+        backend = self.backend
+        self.backend = None
+        self.driver = None
+        if backend is None or backend.driver is None:
+            return
+
+        # a hung driver can block the driver thread, so quit from a throwaway one
+        try:
+            await asyncio.wait_for(
+                asyncio.to_thread(backend.quit), Config.DRIVER_QUIT_TIMEOUT
+            )
+        except Exception as e:
+            self.bot.logger.warning("Failed to quit the old driver cleanly: %s", e)
+
+    async def restart_driver(self):
+        """Replaces the driver with a fresh Chrome and resumes the course.
+
+        Gives up, quitting the new Chrome, if the loop is stopped meanwhile.
+        """
+        resume_url = self.last_course_url
+        await self.quit_driver()
+
+        # the old driver thread may still be stuck in a call to the dead driver
+        self.executor.shutdown()
+        self.executor = DriverExecutor()
+        self.classifier.reset()
+        self.elements.clear()
+        self.watchdog.reset()
+        self.page_token = None
+
+        await self.create_driver()
+        if not self.running:
+            # stopped while Chrome was starting, so nothing else would quit it
+            await self.quit_driver()
+            return
+        await self.start_session()
+        if not self.running:
+            await self.quit_driver()
+            return
+        if resume_url and resume_url != Config.course_url:
+            self.bot.logger.info("Resuming from %s", resume_url)
+            await self.navigate(resume_url)
+        self.progress.restart_stall_timer()
+
+    async def recycle_renderer(self):
+        """Moves the course to a fresh tab, which gets a new renderer process."""
+        url = await self.call(self.backend.current_url)
+
+        def _switch_tab():
+            old_tab = self.driver.current_window_handle
+            self.driver.switch_to.new_window("tab")
+            new_tab = self.driver.current_window_handle
+            self.driver.switch_to.window(old_tab)
+            self.driver.close()
+            self.driver.switch_to.window(new_tab)
+
+        await self.call(_switch_tab)
+        # blocked URLs are set per tab, so the new tab needs them again
+        await self.call(apply_request_blocking, self.driver)
+        self.classifier.reset()
+        self.elements.clear()
+        self.page_token = None
+        await self.navigate(url)
+
+    def reset(self):
+        """Clears the state left over from the previous run."""
+        self.running = True
+        self.metrics.reset()
+        self.classifier.reset()
+        self.elements.clear()
+        self.poller.reset()
+        self.progress.reset()
+        self.watchdog.reset()
+        self.last_course_url = None
+
+    def prepare(self):
+        """Starts Chrome and opens the course in the background.
+
+        Called while the bot is still connecting to Discord so that both
+        happen at once. run() picks up the started driver.
+        """
+        if self.running:
+            return
+        self.bot.logger.info("Starting the WebDriver...")
+        self.reset()
+        self.startup = asyncio.create_task(self.start())
+
+    async def start(self):
+        """Creates the driver and opens the course, recovering from failures."""
+        try:
+            await self.create_driver()
+            startup.mark("chrome started")
+            if not self.running:
+                # stopped while Chrome was starting
+                await self.quit_driver()
+                return
+            await self.start_session()
+            startup.mark("session ready")
+        except Exception as e:
+            # there is no tick to retry yet, so any failure means starting over
+            # with a fresh Chrome, which restart_driver() logs in again
+            if not self.running:
+                raise
+            reason = f"WebDriver failed to start ({type(e).__name__})"
+            if not await self.supervisor.restart(reason):
+                raise
 
     async def run(self):
-        """Starts the WebDriver and begins the automation process."""
+        """Starts the WebDriver and begins the automation process.
+
+        Failures are handed to the supervisor, which retries or restarts
+        Chrome. The loop only gives up when the failure cannot be recovered.
+        """
+        if self.running and self.startup is None:
+            self.bot.logger.warning(
+                "Attempted to start the WebDriver when it was already running."
+            )
+            self.bot.outbox.send("```❌ WebDriver is already running.```")
+            return
+
+        if self.startup is None:
+            self.prepare()
+        task, self.startup = self.startup, None
+
         try:
+            await task
             if self.running:
-                self.bot.logger.warning(
-                    "Attempted to start the WebDriver when it was already running."
-                )
-                await self.bot.log_channel.send(
-                    "```❌ WebDriver is already running.```"
+                self.bot.outbox.send(
+                    "```✅ WebDriver started. Use !help for a list of commands and !stop to stop the WebDriver.```"
                 )
-                return
-            self.bot.logger.info("Starting the WebDriver...")
-            self.running = True
-            await self.create_driver()
-            await self.bot.log_channel.send(
-                "```✅ WebDriver started. Use !help for a list of commands and !stop to stop the WebDriver.```"
-            )
-            await self.login(Config.username, Config.password)
-            await self.start_course()
 
             while self.running:
-                await self.automate()
-                await asyncio.sleep(1)
+                try:
+                    changed = await self.automate()
+                    startup.mark("first tick")
+                    startup.report(self.bot.logger)
+                    self.supervisor.record_success()
+                    await self.watchdog.check()
+                    await self.wait_for_next_tick(changed)
+                except Exception as e:
+                    if not self.running:
+                        break
+                    if not await self.supervisor.recover(e):
+                        raise
 
             self.bot.logger.info("WebDriver stopped.")
         except Exception as e:
             self.bot.logger.error(
-                f"An error occurred while starting the WebDriver: {e}"
+                "An unrecoverable error occurred in the WebDriver: %s", e
             )
-            await self.bot.log_channel.send(
-                "```❌ An error occurred while starting the WebDriver. Exiting.```"
+            self.bot.outbox.send(
+                "```❌ An unrecoverable error occurred in the WebDriver. Use !run to start it again.```"
             )
-            sys.exit(1)
+            self.running = False
+            await self.quit_driver()
 
     async def stop(self):
         """Stops the WebDriver and cleans up resources."""
-        try:
-            if self.running:
-                self.running = False
-                self.driver.quit()
-                self.driver = None
-                await self.bot.log_channel.send("```🛑 WebDriver stopped.```")
-            else:
-                self.bot.logger.warning(
-                    "Attempted to stop the WebDriver when it was not running."
-                )
-                await self.bot.log_channel.send("```❌ WebDriver is not running.```")
-        except Exception as e:
-            self.bot.logger.error(
-                f"An error occurred while stopping the WebDriver: {e}"
+        if not self.running:
+            self.bot.logger.warning(
+                "Attempted to stop the WebDriver when it was not running."
             )
-            await self.bot.log_channel.send(
-                "```❌ An error occurred while stopping the WebDriver. Exiting.```"
-            )
-            sys.exit(1)
+            self.bot.outbox.send("```❌ WebDriver is not running.```")
+            return
+
+        self.running = False
+        await self.quit_driver()
+        self.bot.outbox.send("```🛑 WebDriver stopped.```")
@@ -0,0 +1,217 @@
+import asyncio
+from types import SimpleNamespace
+from config.config import Config, settings
+from services.ipc import MAX_MESSAGE_BYTES, Channel, check_token, decode, encode
+from services.webdriver_service import WebDriverService
+
+# the WebDriverService methods the bot may call, see WorkerProxy
+METHODS = (
+    "run",
+    "stop",
+    "status",
+    "stats",
+    "get_dom",
+    "take_screenshot",
+    "click_element",
+    "replay",
+    "trace",
+)
+
+# how long a lockout waits for its last notifications to reach the bot (s)
+FLUSH_TIMEOUT = 5
+
+
+class RemoteOutbox:
+    """Forwards notifications to the bot, which sends them to the log channel."""
+
+    def __init__(self, host):
+        self.host = host
+
+    def send(self, content):
+        self.host.emit({"event": "notify", "content": content})
+
+    async def flush(self):
+        try:
+            await asyncio.wait_for(self.host.events.join(), FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.host.bot.logger.warning("Notifications could not be sent to the bot.")
+
+
+class RemoteBot:
+    """The parts of the Discord bot that WebDriverService uses, over IPC.
+
+    Prompts are answered by the bot process, which waits for the reply in the
+    log channel, so `wait_for` ignores its `check` argument.
+    """
+
+    user = None
+    log_channel = None
+
+    def __init__(self, host, logger):
+        self.host = host
+        self.logger = logger
+        self.outbox = RemoteOutbox(host)
+
+    async def wait_for(self, event, check=None, timeout=None):
+        return SimpleNamespace(content=await self.host.prompt(timeout))
+
+    async def close(self):
+        """Asks the bot process to shut down too."""
+        self.host.emit({"event": "shutdown"})
+        await self.outbox.flush()
+
+
+class WorkerHost:
+    """Runs WebDriverService in its own process and serves it to the bot.
+
+    The bot connects over a local socket and sends the commands a user gives
+    it; the worker answers them and sends back notifications and prompts as
+    events. Either process can be restarted on its own: events are queued
+    while no bot is connected and sent once it reconnects.
+    """
+
+    def __init__(self, logger):
+        self.bot = RemoteBot(self, logger)
+        self.service = WebDriverService(self.bot)
+        self.channel = None
+        self.connected = asyncio.Event()
+        self.events = asyncio.Queue()
+        self.prompts = {}
+        self.next_prompt = 0
+        self.tasks = set()
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def emit(self, event):
+        """Queues an event for the bot without waiting for it to be sent."""
+        self.events.put_nowait(event)
+
+    async def prompt(self, timeout):
+        """Asks the bot for the user's answer. Raises TimeoutError without one.
+
+        The prompt waits for a bot to connect, and is asked again when the bot
+        reconnects before answering, so restarting the bot doesn't fail it.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.next_prompt += 1
+        prompt_id = self.next_prompt
+        try:
+            while (remaining := deadline - loop.time()) > 0:
+                await asyncio.wait_for(self.connected.wait(), remaining)
+                future = loop.create_future()
+                self.prompts[prompt_id] = future
+                self.emit({"event": "prompt", "id": prompt_id, "timeout": remaining})
+                try:
+                    # the bot enforces the timeout, the margin covers the round trip
+                    content = await asyncio.wait_for(future, remaining + FLUSH_TIMEOUT)
+                except ConnectionError:
+                    continue
+                if content is None:
+                    break
+                return content
+        finally:
+            self.prompts.pop(prompt_id, None)
+        raise asyncio.TimeoutError
+
+    async def serve(self):
+        """Starts the automation loop and serves the bot until the process stops.
+
+        The loop does not wait for a bot, so a restarted worker carries on
+        with the course whether or not the bot is connected yet.
+        """
+        server = await asyncio.start_server(
+            self.handle,
+            Config.WORKER_HOST,
+            Config.WORKER_PORT,
+            limit=MAX_MESSAGE_BYTES,
+        )
+        self.spawn(self._sender())
+        self.spawn(self.service.run())
+        self.bot.logger.success(
+            "Browser worker listening on %s:%d.", Config.WORKER_HOST, Config.WORKER_PORT
+        )
+        async with server:
+            await server.serve_forever()
+
+    async def handle(self, reader, writer):
+        """Serves one bot connection, replacing the previous one."""
+        channel = Channel(reader, writer)
+        try:
+            hello = await asyncio.wait_for(channel.receive(), FLUSH_TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            hello = None
+        if not hello or not check_token(hello.get("token")):
+            self.bot.logger.warning("Rejected a connection that did not authenticate.")
+            await channel.close()
+            return
+
+        if self.channel is not None:
+            await self.channel.close()
+        self.channel = channel
+        self.connected.set()
+        self.bot.logger.success("Bot connected.")
+
+        try:
+            while (message := await channel.receive()) is not None:
+                if "prompt" in message:
+                    future = self.prompts.get(message["prompt"])
+                    if future is not None and not future.done():
+                        future.set_result(message.get("content"))
+                else:
+                    self.spawn(self.handle_request(channel, message))
+        except (ConnectionError, ValueError) as e:
+            self.bot.logger.warning("Bot connection failed: %s", e)
+        finally:
+            if self.channel is channel:
+                self.channel = None
+                self.connected.clear()
+                # open prompts are asked again once a bot reconnects
+                for future in self.prompts.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError("Bot disconnected"))
+                self.bot.logger.warning("Bot disconnected.")
+            await channel.close()
+
+    async def handle_request(self, channel, message):
+        method = message.get("method")
+        reply = {"id": message.get("id")}
+        try:
+            if method == "apply_setting":
+                settings.set(*message["args"])
+                result = None
+            elif method not in METHODS:
+                raise ValueError(f"Unknown method '{method}'")
+            elif method == "run":
+                # the loop runs until stopped, so don't make the bot wait for it
+                self.spawn(self.service.run())
+                result = None
+            else:
+                args = decode(message.get("args", []))
+                result = await getattr(self.service, method)(*args)
+            reply["result"] = encode(result)
+        except Exception as e:
+            reply["error"] = f"{type(e).__name__}: {e}"
+
+        try:
+            await channel.send(reply)
+        except (ConnectionError, OSError):
+            pass
+
+    async def _sender(self):
+        event = None
+        while True:
+            if event is None:
+                event = await self.events.get()
+            await self.connected.wait()
+            try:
+                await self.channel.send(event)
+            except (AttributeError, ConnectionError, OSError):
+                # disconnected while sending, keep the event for the next bot
+                await asyncio.sleep(1)
+                continue
+            event = None
+            self.events.task_done()
@@ -0,0 +1,173 @@
+import asyncio
+from config.config import Config
+from services.ipc import Channel, auth_token, decode, encode
+
+# delay between attempts to reach the browser worker (s)
+RECONNECT_DELAY = 2
+DISCONNECTED = "Lost the connection to the browser worker."
+
+
+class WorkerProxy:
+    """Stands in for WebDriverService when the browser runs in a worker process.
+
+    Commands are forwarded to the worker started with `python3 src/worker.py`,
+    and its notifications and prompts are relayed to the log channel. The
+    connection is re-established whenever either process restarts.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.channel = None
+        self.connected = asyncio.Event()
+        self.pending = {}
+        self.next_id = 0
+        self.task = None
+        self.tasks = set()
+
+    def spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    def prepare(self):
+        """Starts connecting to the worker in the background."""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._connection())
+
+    async def _connection(self):
+        logger = self.bot.logger
+        while True:
+            try:
+                channel = await Channel.connect(Config.WORKER_HOST, Config.WORKER_PORT)
+                await channel.send({"token": auth_token()})
+            except (ConnectionError, OSError) as e:
+                logger.debug("Browser worker not reachable: %s", e)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+
+            self.channel = channel
+            self.connected.set()
+            logger.success(
+                "Connected to the browser worker on %s:%d.",
+                Config.WORKER_HOST,
+                Config.WORKER_PORT,
+            )
+            try:
+                await self._receive(channel)
+            except (ConnectionError, ValueError) as e:
+                logger.warning("Browser worker connection failed: %s", e)
+            finally:
+                self.channel = None
+                self.connected.clear()
+                for future in self.pending.values():
+                    if not future.done():
+                        future.set_exception(ConnectionError(DISCONNECTED))
+                await channel.close()
+
+            logger.warning("%s Reconnecting...", DISCONNECTED)
+            self.bot.outbox.send(f"```⚠️ {DISCONNECTED} Reconnecting...```")
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    async def _receive(self, channel):
+        while (message := await channel.receive()) is not None:
+            event = message.get("event")
+            if event is None:
+                future = self.pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(RuntimeError(message["error"]))
+                else:
+                    future.set_result(decode(message.get("result")))
+            elif event == "notify":
+                self.bot.outbox.send(message["content"])
+            elif event == "prompt":
+                self.spawn(self._answer_prompt(channel, message))
+            elif event == "shutdown":
+                self.spawn(self._shutdown())
+
+    async def _answer_prompt(self, channel, prompt):
+        """Waits for the user's answer in the log channel and sends it to the worker."""
+
+        def check_message(m):
+            return m.author != self.bot.user and m.channel == self.bot.log_channel
+
+        try:
+            msg = await self.bot.wait_for(
+                "message", check=check_message, timeout=prompt["timeout"]
+            )
+            content = msg.content
+        except asyncio.TimeoutError:
+            content = None
+
+        try:
+            await channel.send({"prompt": prompt["id"], "content": content})
+        except (ConnectionError, OSError):
+            pass
+
+    async def _shutdown(self):
+        self.bot.logger.info("The browser worker asked the bot to shut down.")
+        await self.bot.outbox.flush()
+        await self.bot.close()
+
+    async def call(self, method, *args):
+        """Calls a WebDriverService method in the worker and returns its result."""
+        try:
+            await asyncio.wait_for(self.connected.wait(), Config.WORKER_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise ConnectionError("The browser worker is not connected.") from None
+
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            await self.channel.send(
+                {"id": request_id, "method": method, "args": encode(list(args))}
+            )
+            return await future
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def request(self, method, *args, default=None):
+        """Like call(), but reports an unreachable worker and returns `default`."""
+        try:
+            return await self.call(method, *args)
+        except ConnectionError as e:
+            self.bot.logger.error("Browser worker call %s failed: %s", method, e)
+            self.bot.outbox.send(f"```❌ {e}```")
+            return default
+
+    async def run(self):
+        """Restarts the loop after !stop; the worker starts it by itself."""
+        await self.request("run")
+
+    async def stop(self):
+        await self.request("stop")
+
+    async def status(self):
+        return await self.request("status", default="Browser worker: not connected")
+
+    async def stats(self):
+        return await self.request("stats", default="Browser worker: not connected")
+
+    async def get_dom(self):
+        return await self.request("get_dom")
+
+    async def take_screenshot(self, image_format, scale, quality):
+        return await self.request(
+            "take_screenshot", image_format, scale, quality, default=(None, None)
+        )
+
+    async def click_element(self, by, value):
+        return await self.request("click_element", by, value, default=False)
+
+    async def replay(self, count):
+        return await self.request("replay", count, default=(0, 0, None))
+
+    async def trace(self):
+        return await self.request("trace", default=(0, None))
+
+    async def apply_setting(self, name, value):
+        """Applies a setting changed with !set to the worker as well."""
+        await self.request("apply_setting", name, value)
@@ -0,0 +1,52 @@
+import gzip
+import io
+
+IMAGE_FORMATS = {"png": "PNG", "jpeg": "JPEG", "jpg": "JPEG", "webp": "WEBP"}
+
+
+def gzip_text(text):
+    """Compresses text into gzip bytes."""
+    return gzip.compress(text.encode("utf-8"), compresslevel=6)
+
+
+def extension_for(image_format):
+    return "jpg" if IMAGE_FORMATS[image_format] == "JPEG" else image_format
+
+
+def encode_screenshot(
+    screenshot, image_format="png", scale=1.0, quality=70, source_format="png"
+):
+    """Re-encodes a screenshot into the requested format, optionally downscaled.
+
+    Returns the encoded bytes and the file extension that matches them. The
+    screenshot is returned untouched when it is already in the requested
+    format and size, or when Pillow is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:  # an old install without Pillow sends screenshots as taken
+        Image = None
+
+    image_format = image_format.lower()
+    source_format = source_format.lower()
+    if image_format not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format: {image_format}")
+
+    already_encoded = IMAGE_FORMATS[image_format] == IMAGE_FORMATS.get(source_format)
+    if Image is None or (already_encoded and scale >= 1):
+        return screenshot, extension_for(source_format)
+
+    with Image.open(io.BytesIO(screenshot)) as image:
+        if scale < 1:
+            size = (
+                max(1, int(image.width * scale)),
+                max(1, int(image.height * scale)),
+            )
+            image = image.resize(size, Image.LANCZOS)
+        if IMAGE_FORMATS[image_format] == "JPEG":
+            image = image.convert("RGB")
+
+        buffer = io.BytesIO()
+        image.save(buffer, IMAGE_FORMATS[image_format], quality=quality, optimize=True)
+
+    return buffer.getvalue(), extension_for(image_format)
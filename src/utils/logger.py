@@ -1,9 +1,51 @@
+import atexit
+import json
+import os
+import queue
+import threading
+import time
 from colorama import Fore, Style
-from datetime import datetime
 from config.config import Config
 
 
+class JsonLinesSink:
+    """Appends log records to a JSON-lines file, rotating it by size."""
+
+    def __init__(self, path, max_bytes, backups):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.file = open(path, "a", encoding="utf-8")
+
+    def rotate(self):
+        self.file.close()
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        if self.max_bytes and self.file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def close(self):
+        self.file.close()
+
+
 class Logger:
+    """Logs to the console (and optionally a JSON-lines file) from a background thread.
+
+    Messages use %-style arguments, which are only formatted by the writer
+    thread, and levels below LOG_LEVEL are dropped before anything is queued.
+    """
+
     LOG_STYLES = {
         "INFO": (Fore.CYAN, "[+]"),
         "WARNING": (Fore.MAGENTA, "[!]"),
@@ -12,27 +54,85 @@ class Logger:
         "DEBUG": (Fore.YELLOW, "[*]"),
     }
 
-    def generate_timestamp(self):
-        return f"{Fore.LIGHTBLACK_EX}{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}{Style.RESET_ALL}"
+    def __init__(self):
+        self.queue = queue.SimpleQueue()
+        self.sink = None
+        if Config.LOG_FILE:
+            self.sink = JsonLinesSink(
+                Config.LOG_FILE, Config.LOG_FILE_MAX_BYTES, Config.LOG_FILE_BACKUPS
+            )
+        self.timestamp_second = None
+        self.timestamp = None
+
+        self.thread = threading.Thread(target=self._worker, name="logger", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    def generate_timestamp(self, created):
+        # the formatted timestamp only changes once per second
+        second = int(created)
+        if second != self.timestamp_second:
+            self.timestamp_second = second
+            formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            self.timestamp = f"{Fore.LIGHTBLACK_EX}{formatted}{Style.RESET_ALL}"
+        return self.timestamp
+
+    LEVELS = {"DEBUG": 10, "INFO": 20, "SUCCESS": 20, "WARNING": 30, "ERROR": 40}
+
+    def is_enabled(self, level):
+        return self.LEVELS.get(level, 40) >= self.LEVELS[Config.LOG_LEVEL.upper()]
+
+    def log(self, level, message, *args):
+        if self.is_enabled(level):
+            self.queue.put((time.time(), level, message, args))
+
+    def _format(self, message, args):
+        if not args:
+            return str(message)
+        try:
+            return str(message) % args
+        except (TypeError, ValueError):
+            return " ".join([str(message)] + [str(arg) for arg in args])
+
+    def _worker(self):
+        while True:
+            record = self.queue.get()
+            if record is None:
+                break
+
+            created, level, message, args = record
+            text = self._format(message, args)
+            color, symbol = self.LOG_STYLES.get(level, (Fore.WHITE, "[?]"))
+            print(
+                f"{color}{symbol} {Fore.WHITE}{Style.RESET_ALL} {self.generate_timestamp(created)} → {text}"
+            )
+
+            if self.sink is not None:
+                try:
+                    self.sink.write({"time": created, "level": level, "message": text})
+                except OSError as e:
+                    print(f"{Fore.RED}[X]{Style.RESET_ALL} Failed to write log file: {e}")
 
-    def log(self, level, message):
-        color, symbol = self.LOG_STYLES.get(level, (Fore.WHITE, "[?]"))
-        print(
-            f"{color}{symbol} {Fore.WHITE}{Style.RESET_ALL} {self.generate_timestamp()} → {message}"
-        )
+    def close(self):
+        """Writes out every queued message and stops the writer thread."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join(timeout=2)
+        if self.sink is not None:
+            self.sink.close()
+            self.sink = None
 
-    def info(self, message):
-        self.log("INFO", message)
+    def info(self, message, *args):
+        self.log("INFO", message, *args)
 
-    def warning(self, message):
-        self.log("WARNING", message)
+    def warning(self, message, *args):
+        self.log("WARNING", message, *args)
 
-    def error(self, message):
-        self.log("ERROR", message)
+    def error(self, message, *args):
+        self.log("ERROR", message, *args)
 
-    def success(self, message):
-        self.log("SUCCESS", message)
+    def success(self, message, *args):
+        self.log("SUCCESS", message, *args)
 
-    def debug(self, message):
-        if Config.DEBUG:
-            self.log("DEBUG", message)
+    def debug(self, message, *args):
+        self.log("DEBUG", message, *args)
@@ -0,0 +1,70 @@
+import time
+
+
+def load_psutil():
+    """Returns the psutil module, or None when it is not installed."""
+    try:
+        import psutil
+    except ImportError:  # psutil is optional, resources are not measured without it
+        return None
+    return psutil
+
+
+def driver_processes(driver):
+    """Returns the chromedriver process and every Chrome process it spawned.
+
+    Returns no processes when psutil is not installed.
+    """
+    psutil = load_psutil()
+    if psutil is None:
+        return []
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        return [root] + root.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return []
+
+
+def sample_processes(processes, interval=None):
+    """Sums the RSS (bytes) and CPU usage (percent of one core) of the processes.
+
+    With an interval, CPU usage is measured over that many seconds; otherwise
+    it is measured since the previous sample of the same process objects.
+    """
+    if not processes:
+        return {"rss": 0, "cpu": 0.0, "processes": 0}
+
+    import psutil
+
+    if interval:
+        for process in processes:
+            try:
+                process.cpu_percent(None)
+            except psutil.Error:
+                pass
+        time.sleep(interval)
+
+    rss = 0
+    cpu = 0.0
+    for process in processes:
+        try:
+            rss += process.memory_info().rss
+            cpu += process.cpu_percent(None)
+        except psutil.Error:
+            pass
+    return {"rss": rss, "cpu": cpu, "processes": len(processes)}
+
+
+def client_memory(bot):
+    """Reports the bot process RSS and the size of the Discord caches.
+
+    The RSS is in bytes, or None when psutil is not installed.
+    """
+    psutil = load_psutil()
+    return {
+        "rss": psutil.Process().memory_info().rss if psutil else None,
+        "guilds": len(bot.guilds),
+        "channels": sum(len(guild.channels) for guild in bot.guilds),
+        "members": sum(len(guild.members) for guild in bot.guilds),
+        "messages": len(bot.cached_messages),
+    }
@@ -0,0 +1,32 @@
+import time
+
+
+class StartupProfile:
+    """Records when each startup step finished, relative to the first import.
+
+    bot.py imports this module before anything else, so the clock starts at
+    roughly the moment the process did.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.marks = []
+        self.reported = False
+
+    def mark(self, name):
+        if self.reported:
+            return
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def report(self, logger):
+        """Logs the startup breakdown once."""
+        if self.reported:
+            return
+        self.reported = True
+        logger.info(
+            "Startup timings: %s",
+            ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.marks),
+        )
+
+
+startup = StartupProfile()
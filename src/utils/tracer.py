@@ -0,0 +1,137 @@
+import asyncio
+import contextlib
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from config.config import Config
+
+NULL_SPAN = contextlib.nullcontext()
+
+
+class Tracer:
+    """Records spans in the Chrome Trace Event format, for Perfetto or chrome://tracing.
+
+    Nothing is recorded unless TRACE_ENABLED is on, and only the latest
+    `capacity` spans are kept. Spans from coroutines are grouped by asyncio
+    task, and spans from other threads (the driver thread) by thread.
+    """
+
+    def __init__(self, capacity):
+        self.events = deque(maxlen=capacity)
+        self.tracks = {}
+        self.pid = os.getpid()
+
+    def track(self):
+        """Returns the track id of the current task or thread, naming it once."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:  # not on the event loop thread
+            task = None
+        if task is not None:
+            key = id(task)
+            if key not in self.tracks:
+                self.tracks[key] = task.get_name()
+        else:
+            key = threading.get_ident()
+            if key not in self.tracks:
+                self.tracks[key] = threading.current_thread().name
+        return key
+
+    @contextlib.contextmanager
+    def record(self, name, category, args=None):
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": started // 1000,
+                "dur": (time.perf_counter_ns() - started) // 1000,
+                "pid": self.pid,
+                "tid": self.track(),
+            }
+            if args:
+                event["args"] = args
+            self.events.append(event)
+
+    def span(self, name, category, **args):
+        """Returns a context manager that records a span around its body."""
+        if not Config.TRACE_ENABLED:
+            return NULL_SPAN
+        return self.record(name, category, args)
+
+    def clear(self):
+        self.events.clear()
+        self.tracks.clear()
+
+    def export(self):
+        """Returns the recorded spans as Chrome Trace Event JSON."""
+        events = list(self.events)
+        tids = {event["tid"] for event in events}
+        names = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in list(self.tracks.items())
+            if tid in tids
+        ]
+        return json.dumps({"traceEvents": names + events, "displayTimeUnit": "ms"})
+
+
+tracer = Tracer(Config.TRACE_BUFFER)
+
+
+def traced(func, category):
+    """Wraps a coroutine function so every call is recorded as a span."""
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if not Config.TRACE_ENABLED:
+            return await func(*args, **kwargs)
+        with tracer.record(name, category):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_methods(category):
+    """Class decorator that traces every coroutine method of the class."""
+
+    def decorate(cls):
+        for name, value in list(vars(cls).items()):
+            if inspect.iscoroutinefunction(value):
+                setattr(cls, name, traced(value, category))
+        return cls
+
+    return decorate
+
+
+def trace_webdriver(driver):
+    """Records a span for every WebDriver command the driver sends.
+
+    Element methods such as click() go through the same `execute`, so they
+    are recorded too. CDP commands are named after the CDP method.
+    """
+    execute = driver.execute
+
+    def traced_execute(driver_command, params=None):
+        if not Config.TRACE_ENABLED:
+            return execute(driver_command, params)
+        name = driver_command
+        if driver_command == "executeCdpCommand" and params:
+            name = params.get("cmd", driver_command)
+        with tracer.record(name, "webdriver"):
+            return execute(driver_command, params)
+
+    driver.execute = traced_execute
@@ -0,0 +1,20 @@
+"""Runs the browser automation in its own process, for SPLIT_PROCESS mode.
+
+Usage: python3 src/worker.py, then start the bot with SPLIT_PROCESS=true.
+"""
+from utils.startup_profile import startup
+
+import asyncio
+
+from services.worker_host import WorkerHost
+from utils.logger import Logger
+
+startup.mark("imports")
+
+
+async def main():
+    await WorkerHost(Logger()).serve()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())